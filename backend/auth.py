@@ -8,6 +8,7 @@ from flask import request, jsonify, current_app
 import os
 import hashlib
 import hmac
+import itertools
 from typing import Optional, List
 
 class AuthConfig:
@@ -16,6 +17,7 @@ class AuthConfig:
     def __init__(self):
         # API key for frontend authentication
         self.api_key = os.getenv("API_KEY", "dev-api-key-change-in-production")
+        self._api_key_bytes = self.api_key.encode()  # Encoded once for per-request comparison
         self.api_key_header = "X-API-Key"
         
         # Allowed origins (same as CORS origins)
@@ -33,6 +35,10 @@ class AuthConfig:
             production_origins = [origin.strip() for origin in allowed_origins_str.split(",") if origin.strip()]
             self.allowed_origins.extend(production_origins)
         
+        # Precomputed lookups: exact origin matches and referrer prefixes (longest first)
+        self._origin_set = frozenset(self.allowed_origins)
+        self._origin_prefix_tuple = tuple(sorted(self._origin_set, key=len, reverse=True))
+        
         # Optional: Referrer validation
         self.check_referrer = os.getenv("CHECK_REFERRER", "true").lower() == "true"
         
@@ -40,18 +46,20 @@ class AuthConfig:
         self.rate_limit_enabled = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
         self.rate_limit_requests = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
         self.rate_limit_window = int(os.getenv("RATE_LIMIT_WINDOW", "60"))  # seconds
+        
+        # Log 1 in N successful authentications (0 disables the success log)
+        self.auth_log_sample = int(os.getenv("AUTH_LOG_SAMPLE", "0"))
 
 auth_config = AuthConfig()
+_auth_counter = itertools.count()  # Successful authentications, for sampled logging
 
-def validate_api_key(provided_key: str) -> bool:
+def validate_api_key(provided_key: Optional[str]) -> bool:
     """Validate the provided API key."""
-    expected_key = auth_config.api_key
-    
-    # Use constant-time comparison to prevent timing attacks
-    if len(provided_key) != len(expected_key):
+    if provided_key is None:
         return False
     
-    return hmac.compare_digest(provided_key.encode(), expected_key.encode())
+    # Use constant-time comparison to prevent timing attacks (handles unequal lengths too)
+    return hmac.compare_digest(provided_key.encode(), auth_config._api_key_bytes)
 
 def validate_origin(origin: Optional[str]) -> bool:
     """Validate the request origin."""
@@ -61,7 +69,7 @@ def validate_origin(origin: Optional[str]) -> bool:
         return current_app.config.get('DEBUG', False)
     
     # Check if origin is in allowed list
-    return origin in auth_config.allowed_origins
+    return origin in auth_config._origin_set
 
 def validate_referrer(referrer: Optional[str]) -> bool:
     """Validate the request referrer."""
@@ -72,11 +80,7 @@ def validate_referrer(referrer: Optional[str]) -> bool:
         return not auth_config.check_referrer  # Allow if referrer checking is disabled
     
     # Check if referrer starts with allowed origins
-    for allowed_origin in auth_config.allowed_origins:
-        if referrer.startswith(allowed_origin):
-            return True
-    
-    return False
+    return referrer.startswith(auth_config._origin_prefix_tuple)
 
 def require_auth(f):
     """
@@ -124,8 +128,9 @@ def require_auth(f):
                 'message': 'Requests from this referrer are not allowed'
             }), 403
         
-        # Log successful authentication (for monitoring)
-        current_app.logger.info(f"Authenticated request from {origin} to {request.endpoint}")
+        # Log a sample of successful authentications (for monitoring)
+        if auth_config.auth_log_sample and next(_auth_counter) % auth_config.auth_log_sample == 0:
+            current_app.logger.info(f"Authenticated request from {origin} to {request.endpoint}")
         
         return f(*args, **kwargs)
     
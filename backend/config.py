@@ -5,9 +5,10 @@ Converted from FastAPI pydantic settings
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
-@dataclass
+@dataclass(frozen=True)
 class Settings:
     """Application settings."""
     
@@ -48,6 +49,7 @@ class Settings:
     # Pagination settings
     default_page_size: int = int(os.getenv("DEFAULT_PAGE_SIZE", "20"))
     max_page_size: int = int(os.getenv("MAX_PAGE_SIZE", "10000"))
+    optimize_pagination_for_speed: bool = os.getenv("OPTIMIZE_PAGINATION_FOR_SPEED", "false").lower() == "true"
     
     # Logging
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
@@ -56,6 +58,7 @@ class Settings:
     environment: str = os.getenv("ENVIRONMENT", "development")
     stage: str = os.getenv("STAGE", "dev")
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings."""
+    """Get application settings (built once and shared)."""
     return Settings() 
\ No newline at end of file
@@ -3,8 +3,9 @@ Lambda handler for AWS SAM deployment
 Wraps the Flask application for AWS Lambda
 """
 
-import json
-import base64
+import orjson
+from apig_wsgi import make_lambda_handler
+
 from app import app
 
 def handler(event, context):
@@ -21,112 +22,47 @@ def handler(event, context):
         # Direct invocation or other event types
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': orjson.dumps({
                 'message': 'Stanford Research Opportunities API',
                 'version': '1.0.0-flask-sam',
                 'event_type': 'direct_invocation'
-            })
+            }).decode()
         }
 
+# WSGI adapter: translates API Gateway proxy events to WSGI environ and back in one pass
+_wsgi_handler = make_lambda_handler(app, binary_support=False)
+
+# CORS headers forced onto every proxied response
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Amz-Date, X-Api-Key, X-Amz-Security-Token, X-Amz-User-Agent, X-API-Key',
+}
+
 def handle_api_gateway_proxy(event, context):
     """Handle API Gateway proxy integration events."""
+    try:
+        response = _wsgi_handler(event, context)
+    except Exception as e:
+        # Handle errors
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-API-Key'
+            },
+            'body': orjson.dumps({
+                'error': 'Internal server error',
+                'message': str(e)
+            }).decode()
+        }
     
-    # Extract request details from the event
-    http_method = event.get('httpMethod', 'GET')
-    path = event.get('path', '/')
-    query_string_parameters = event.get('queryStringParameters') or {}
-    headers = event.get('headers') or {}
-    body = event.get('body', '')
-    is_base64_encoded = event.get('isBase64Encoded', False)
-    
-    # Decode body if base64 encoded
-    if is_base64_encoded and body:
-        body = base64.b64decode(body).decode('utf-8')
+    # Ensure CORS headers are present; multi-value headers (e.g. Set-Cookie) are kept intact
+    if 'multiValueHeaders' in response:
+        response['multiValueHeaders'].update({key: [value] for key, value in _CORS_HEADERS.items()})
+    else:
+        response.setdefault('headers', {}).update(_CORS_HEADERS)
     
-    # Create a test client for the Flask app
-    with app.test_client() as client:
-        # Build query string
-        query_string = ''
-        if query_string_parameters:
-            query_params = []
-            for key, value in query_string_parameters.items():
-                if value is not None:
-                    query_params.append(f"{key}={value}")
-            if query_params:
-                query_string = '?' + '&'.join(query_params)
-        
-        # Make the request to Flask
-        full_path = path + query_string
-        
-        # Set up headers for the request
-        flask_headers = {}
-        for key, value in headers.items():
-            # Convert API Gateway headers to Flask format
-            if key.lower() not in ['host', 'content-length']:
-                flask_headers[key] = value
-        
-        try:
-            # Make the request
-            if http_method == 'GET':
-                response = client.get(full_path, headers=flask_headers)
-            elif http_method == 'POST':
-                response = client.post(full_path, data=body, headers=flask_headers, 
-                                     content_type=headers.get('Content-Type', 'application/json'))
-            elif http_method == 'PUT':
-                response = client.put(full_path, data=body, headers=flask_headers,
-                                    content_type=headers.get('Content-Type', 'application/json'))
-            elif http_method == 'DELETE':
-                response = client.delete(full_path, headers=flask_headers)
-            elif http_method == 'OPTIONS':
-                response = client.options(full_path, headers=flask_headers)
-            else:
-                # Unsupported method
-                return {
-                    'statusCode': 405,
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'Access-Control-Allow-Origin': '*',
-                        'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-                        'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-API-Key'
-                    },
-                    'body': json.dumps({
-                        'error': 'Method not allowed',
-                        'message': f'HTTP method {http_method} is not supported'
-                    })
-                }
-            
-            # Convert Flask response to API Gateway format
-            response_headers = {}
-            for key, value in response.headers:
-                response_headers[key] = value
-            
-            # Ensure CORS headers are present
-            response_headers['Access-Control-Allow-Origin'] = '*'
-            response_headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-            response_headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Amz-Date, X-Api-Key, X-Amz-Security-Token, X-Amz-User-Agent, X-API-Key'
-            
-            # Get response body
-            response_body = response.get_data(as_text=True)
-            
-            return {
-                'statusCode': response.status_code,
-                'headers': response_headers,
-                'body': response_body,
-                'isBase64Encoded': False
-            }
-            
-        except Exception as e:
-            # Handle errors
-            return {
-                'statusCode': 500,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-API-Key'
-                },
-                'body': json.dumps({
-                    'error': 'Internal server error',
-                    'message': str(e)
-                })
-            } 
\ No newline at end of file
+    return response
@@ -2,6 +2,7 @@
 
 import os
 import sys
+import sqlparse
 from sqlalchemy import create_engine, text
 from loguru import logger
 
@@ -27,11 +28,16 @@ def run_migrations():
         with open(migration_file, 'r') as f:
             migration_sql = f.read()
             
+        # Split into individual statements (sqlparse keeps $$-quoted bodies intact)
+        statements = [stmt.strip() for stmt in sqlparse.split(migration_sql) if stmt.strip()]
+        
         with engine.connect() as conn:
             # Execute migration in a transaction
             with conn.begin():
-                logger.info(f"Running migration: {migration_file}")
-                conn.execute(text(migration_sql))
+                logger.info(f"Running migration: {migration_file} ({len(statements)} statements)")
+                for i, statement in enumerate(statements, 1):
+                    logger.info(f"Statement {i}/{len(statements)}: {statement.splitlines()[0][:80]}")
+                    conn.execute(text(statement))
                 logger.success(f"Successfully ran migration: {migration_file}")
         
         logger.success("All migrations completed successfully!")
@@ -16,6 +16,12 @@ class Opportunity(db.Model):
     """Research funding and internship opportunities."""
     
     __tablename__ = "opportunities"
+    __table_args__ = (
+        # GIN index so full-text queries on search_vector avoid sequential scans
+        db.Index("idx_opportunities_search_vector", "search_vector", postgresql_using="gin"),
+        # Serves newest-first keyset pagination over active opportunities
+        db.Index("idx_opportunities_active_scraped_id", "is_active", "scraped_at", "id"),
+    )
     
     id = db.Column(db.Integer, primary_key=True, index=True)
     title = db.Column(db.Text, nullable=False)
@@ -3,40 +3,81 @@ Health check routes for Flask application
 Converted from FastAPI health endpoints
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify
 from datetime import datetime
 import os
+import time
 
 health_bp = Blueprint('health', __name__)
 
+# Constant body for load balancer probes
+_HEALTHZ_BODY = b'{"status":"ok"}\n'
+_HEALTHZ_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('Content-Length', str(len(_HEALTHZ_BODY))),
+]
+
+
+# Prebuilt /ping body and the parts of /health that never change for the process
+_PING_BODY = b'{"message":"pong","status":"ok"}\n'
+_HEALTH_STATIC = {
+    "status": "ok",
+    "message": "Stanford Research Opportunities API is healthy",
+    "version": "1.0.0-flask",
+    "environment": os.getenv("STAGE", "prod"),
+    "database_configured": bool(os.getenv("DATABASE_URL")),
+    "framework": "Flask"
+}
+
+
+# (epoch second, ISO string) of the last formatted timestamp
+_now_iso_cache = (0, "")
+
+
+def now_iso() -> str:
+    """Current time as an ISO string, formatted at most once per second."""
+    global _now_iso_cache
+    second = int(time.time())
+    if _now_iso_cache[0] != second:
+        _now_iso_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _now_iso_cache[1]
+
+
+class HealthzMiddleware:
+    """WSGI middleware answering GET /healthz before Flask's request handling.
+    
+    Probes skip request context setup, CORS and routing entirely.
+    """
+    
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+    
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') == '/healthz' and environ.get('REQUEST_METHOD') in ('GET', 'HEAD'):
+            start_response('200 OK', _HEALTHZ_HEADERS)
+            return [] if environ['REQUEST_METHOD'] == 'HEAD' else [_HEALTHZ_BODY]
+        return self.wsgi_app(environ, start_response)
+
 @health_bp.route('/ping')
 def ping():
     """Simple ping endpoint for testing connectivity."""
-    return jsonify({"message": "pong", "status": "ok"})
+    return Response(_PING_BODY, mimetype='application/json')
 
 @health_bp.route('/health')
 def health_check():
     """Health check endpoint for monitoring and deployment."""
     try:
-        return jsonify({
-            "status": "ok",
-            "message": "Stanford Research Opportunities API is healthy",
-            "version": "1.0.0-flask",
-            "timestamp": datetime.now().isoformat(),
-            "environment": os.getenv("STAGE", "prod"),
-            "database_configured": bool(os.getenv("DATABASE_URL")),
-            "framework": "Flask"
-        })
+        return jsonify({**_HEALTH_STATIC, "timestamp": now_iso()})
     except Exception as e:
         return jsonify({
             "status": "error",
             "message": f"Health check failed: {str(e)}",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }), 500
 
 @health_bp.route('/healthz')
 def healthz():
-    """Alternative health check endpoint (Kubernetes style)."""
+    """Alternative health check endpoint (Kubernetes style); normally answered by HealthzMiddleware."""
     return jsonify({"status": "ok"})
 
 @health_bp.route('/ready')
@@ -44,5 +85,5 @@ def ready():
     """Readiness check endpoint."""
     return jsonify({
         "status": "ready",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }) 
\ No newline at end of file
@@ -3,15 +3,90 @@ Opportunities API routes
 """
 
 from flask import Blueprint, request, jsonify
-from sqlalchemy import and_, or_, func, desc, text
+from sqlalchemy import and_, or_, bindparam, func, desc, select, text, tuple_
 from sqlalchemy.orm import Query
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import base64
+import threading
+import time
+import orjson
 
+from config import get_settings
 from models import db, Opportunity
 
 opportunities_bp = Blueprint('opportunities', __name__)
 
+# Short-lived cache of filtered COUNT(*) results, keyed by the normalized filter params
+_COUNT_CACHE_TTL = 60.0  # seconds
+_COUNT_CACHE_MAX = 256
+_count_cache: Dict[tuple, Tuple[float, int]] = {}
+_count_cache_lock = threading.Lock()
+
+
+def _cached_count(query: Query, key: tuple, exact: bool = False) -> int:
+    """Return the row count for a filtered query, reusing a recent result unless exact is set."""
+    now = time.monotonic()
+    if not exact:
+        with _count_cache_lock:
+            hit = _count_cache.get(key)
+        if hit is not None and now - hit[0] < _COUNT_CACHE_TTL:
+            return hit[1]
+    
+    # ORDER BY (including ts_rank) is irrelevant to the count
+    total = query.order_by(None).count()
+    
+    with _count_cache_lock:
+        if key not in _count_cache and len(_count_cache) >= _COUNT_CACHE_MAX:
+            _count_cache.pop(next(iter(_count_cache)))  # Drop the oldest entry
+        _count_cache[key] = (now, total)
+    return total
+
+
+def _encode_cursor(opp: Opportunity) -> str:
+    """Encode the (scraped_at, id) keyset position after this row as an opaque cursor."""
+    scraped_at = opp.scraped_at.isoformat() if opp.scraped_at is not None else None
+    return base64.urlsafe_b64encode(orjson.dumps([scraped_at, opp.id])).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Decode a cursor produced by _encode_cursor; raises ValueError if malformed."""
+    try:
+        scraped_at, opp_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (datetime.fromisoformat(scraped_at) if scraped_at is not None else None), int(opp_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def _keyset_filter(cursor_scraped_at: Optional[datetime], cursor_id: int):
+    """Rows after a cursor in (scraped_at DESC, id DESC) order, where NULL scraped_at sorts first."""
+    if cursor_scraped_at is None:
+        # Finish the undated rows, then continue with every dated one
+        return or_(
+            and_(Opportunity.scraped_at.is_(None), Opportunity.id < cursor_id),
+            Opportunity.scraped_at.isnot(None)
+        )
+    # Undated rows all came earlier; the row comparison never matches them
+    return tuple_(Opportunity.scraped_at, Opportunity.id) < (cursor_scraped_at, cursor_id)
+
+
+def _search_tsquery(query_text: str):
+    """Parse user search text with websearch_to_tsquery, once per statement."""
+    # One-row CTE, so the @@ match and ts_rank share a single parsed tsquery
+    search_q = select(
+        func.websearch_to_tsquery('english', bindparam('q', query_text)).label('q')
+    ).cte('search_q')
+    return search_q.c.q
+
+
+def _opportunity_dict(opp: Opportunity) -> Dict[str, Any]:
+    """Serialize an opportunity with the computed fields kept for backward compatibility."""
+    opp_dict = opp.to_dict()
+    opp_dict['category'] = opp.opportunity_type
+    opp_dict['url'] = opp.application_url
+    opp_dict['requirements'] = opp.eligibility_requirements
+    return opp_dict
+
 
 @opportunities_bp.route('/health', methods=['GET'])
 def health_check():
@@ -31,28 +106,23 @@ def get_opportunities():
         category = request.args.get('category', '').strip()
         department = request.args.get('department', '').strip()
         has_funding = request.args.get('has_funding', '').lower() == 'true'
+        cursor = request.args.get('cursor', '').strip()  # Keyset position for newest-first browsing
+        exact_count = request.args.get('exact_count', '').lower() == 'true'  # Bypass the count cache
         
         # Start with base query
         query = db.session.query(Opportunity).filter(Opportunity.is_active == True)
         
         # Apply search filter using full-text search
         if search_query:
-            # Convert search query to tsquery format
-            # Handle simple queries and phrases
-            if '"' in search_query:
-                # Handle phrase search
-                tsquery = search_query.replace('"', "'")
-            else:
-                # Handle individual terms with OR logic
-                terms = search_query.split()
-                tsquery = ' | '.join(terms)
+            # websearch_to_tsquery handles quoted phrases, OR and -exclusions itself
+            tsquery = _search_tsquery(search_query)
             
             try:
                 # Use full-text search with ranking
                 query = query.filter(
-                    Opportunity.search_vector.op('@@')(func.to_tsquery('english', tsquery))
+                    Opportunity.search_vector.op('@@')(tsquery)
                 ).order_by(
-                    desc(func.ts_rank(Opportunity.search_vector, func.to_tsquery('english', tsquery)))
+                    desc(func.ts_rank(Opportunity.search_vector, tsquery))
                 )
             except Exception as e:
                 # Fallback to basic text search if full-text search fails
@@ -65,8 +135,8 @@ def get_opportunities():
                     )
                 )
         else:
-            # Default ordering by scraped_at (newest first)
-            query = query.order_by(desc(Opportunity.scraped_at))
+            # Default ordering by scraped_at (newest first), id breaks ties for keyset paging
+            query = query.order_by(desc(Opportunity.scraped_at).nulls_first(), desc(Opportunity.id))
         
         # Apply category filter
         if category:
@@ -83,31 +153,57 @@ def get_opportunities():
                 Opportunity.funding_amount != ''
             ))
         
-        # Get total count before pagination
-        total_count = query.count()
-        
-        # Apply pagination - use skip if provided, otherwise calculate from page
-        offset = skip if skip > 0 else (page - 1) * limit
-        opportunities = query.offset(offset).limit(limit).all()
+        # Fast mode skips COUNT(*) and reports has_next from one extra row instead
+        fast = request.args.get('fast') == '1' or get_settings().optimize_pagination_for_speed
         
-        # Convert to dict format
-        opportunities_data = []
-        for opp in opportunities:
-            opp_dict = opp.to_dict()
-            # Add computed fields for backward compatibility
-            opp_dict['category'] = opp.opportunity_type
-            opp_dict['url'] = opp.application_url
-            opp_dict['requirements'] = opp.eligibility_requirements
-            opportunities_data.append(opp_dict)
+        # Keyset pagination: without a search ranking, continue after the cursor's
+        # (scraped_at, id) with an index range scan instead of skipping rows
+        if cursor and search_query:
+            return jsonify({"error": "cursor cannot be combined with search; use page or skip"}), 400
+        use_keyset = bool(cursor)
+        if use_keyset:
+            try:
+                cursor_scraped_at, cursor_id = _decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
         
-        return jsonify({
-            "opportunities": opportunities_data,
-            "pagination": {
+        if fast:
+            pagination = {"page": page, "limit": limit}
+        else:
+            # Get total count before pagination (cached briefly per filter combination)
+            count_key = (search_query, category, department, has_funding)
+            total_count = _cached_count(query, count_key, exact=exact_count)
+            pagination = {
                 "page": page,
                 "limit": limit,
                 "total": total_count,
                 "pages": (total_count + limit - 1) // limit
             }
+        
+        if use_keyset:
+            query = query.filter(_keyset_filter(cursor_scraped_at, cursor_id))
+        else:
+            # Offset pagination - use skip if provided, otherwise calculate from page
+            offset = skip if skip > 0 else (page - 1) * limit
+            query = query.offset(offset)
+        
+        if fast:
+            # One extra row tells whether another page follows
+            rows = query.limit(limit + 1).all()
+            has_next = len(rows) > limit
+            rows = rows[:limit]
+            pagination["has_next"] = has_next
+        else:
+            rows = query.limit(limit).all()
+            has_next = len(rows) == limit
+        
+        # A newest-first page with more rows after it gets a cursor for fetching the next one
+        if not search_query:
+            pagination["next_cursor"] = _encode_cursor(rows[-1]) if rows and has_next else None
+        
+        return jsonify({
+            "opportunities": [_opportunity_dict(opp) for opp in rows],
+            "pagination": pagination
         })
         
     except Exception as e:
@@ -124,50 +220,36 @@ def search_opportunities():
         if not query_text:
             return jsonify({"opportunities": [], "total": 0})
         
-        # Prepare the search query for PostgreSQL full-text search
-        # Handle simple queries and phrases
-        if '"' in query_text:
-            # Handle phrase search
-            tsquery = query_text.replace('"', "'")
-        else:
-            # Handle individual terms with OR logic for broader results
-            terms = query_text.split()
-            tsquery = ' | '.join(terms)
+        # websearch_to_tsquery handles quoted phrases, OR and -exclusions itself
+        tsquery = _search_tsquery(query_text)
         
         try:
             # Use full-text search with ranking
-            opportunities = db.session.query(Opportunity).filter(
-                and_(
+            opportunities = db.session.execute(
+                select(Opportunity).where(
                     Opportunity.is_active == True,
-                    Opportunity.search_vector.op('@@')(func.to_tsquery('english', tsquery))
-                )
-            ).order_by(
-                desc(func.ts_rank(Opportunity.search_vector, func.to_tsquery('english', tsquery)))
-            ).limit(limit).all()
+                    Opportunity.search_vector.op('@@')(tsquery)
+                ).order_by(
+                    desc(func.ts_rank(Opportunity.search_vector, tsquery))
+                ).limit(limit)
+            ).scalars().all()
             
         except Exception as search_error:
             # Fallback to basic ILIKE search if full-text search fails
             search_terms = f"%{query_text}%"
-            opportunities = db.session.query(Opportunity).filter(
-                and_(
+            opportunities = db.session.execute(
+                select(Opportunity).where(
                     Opportunity.is_active == True,
                     or_(
                         Opportunity.title.ilike(search_terms),
                         Opportunity.description.ilike(search_terms),
                         Opportunity.department.ilike(search_terms)
                     )
-                )
-            ).order_by(desc(Opportunity.scraped_at)).limit(limit).all()
+                ).order_by(desc(Opportunity.scraped_at)).limit(limit)
+            ).scalars().all()
         
         # Convert to dict format
-        opportunities_data = []
-        for opp in opportunities:
-            opp_dict = opp.to_dict()
-            # Add computed fields for backward compatibility
-            opp_dict['category'] = opp.opportunity_type
-            opp_dict['url'] = opp.application_url
-            opp_dict['requirements'] = opp.eligibility_requirements
-            opportunities_data.append(opp_dict)
+        opportunities_data = [_opportunity_dict(opp) for opp in opportunities]
         
         return jsonify({
             "opportunities": opportunities_data,
@@ -183,50 +265,52 @@ def get_opportunity_stats():
     """Get opportunity statistics including recent new opportunities."""
     try:
         # Get total active opportunities
-        total_active = db.session.query(Opportunity).filter(
-            Opportunity.is_active == True
-        ).count()
+        total_active = db.session.scalar(
+            select(func.count(Opportunity.id)).where(Opportunity.is_active == True)
+        )
         
         # Get opportunities by status
-        status_counts = db.session.query(
-            Opportunity.status,
-            func.count(Opportunity.id).label('count')
-        ).filter(
-            Opportunity.is_active == True
-        ).group_by(Opportunity.status).all()
+        status_counts = db.session.execute(
+            select(
+                Opportunity.status,
+                func.count(Opportunity.id).label('count')
+            ).where(
+                Opportunity.is_active == True
+            ).group_by(Opportunity.status)
+        ).all()
         
         # Get recent new opportunities (last 7 days)
         cutoff_date = datetime.now() - timedelta(days=7)
-        recent_new = db.session.query(Opportunity).filter(
-            and_(
+        recent_new = db.session.scalar(
+            select(func.count(Opportunity.id)).where(
                 Opportunity.first_seen_at >= cutoff_date,
                 or_(Opportunity.status == 'new', Opportunity.status == 'active'),
                 Opportunity.is_active == True
             )
-        ).count()
+        )
         
         # Get opportunities with funding
-        funded_count = db.session.query(Opportunity).filter(
-            and_(
+        funded_count = db.session.scalar(
+            select(func.count(Opportunity.id)).where(
                 Opportunity.is_active == True,
                 Opportunity.funding_amount.isnot(None),
                 Opportunity.funding_amount != ''
             )
-        ).count()
+        )
         
         # Get top departments
-        top_departments = db.session.query(
-            Opportunity.department,
-            func.count(Opportunity.id).label('count')
-        ).filter(
-            and_(
+        top_departments = db.session.execute(
+            select(
+                Opportunity.department,
+                func.count(Opportunity.id).label('count')
+            ).where(
                 Opportunity.is_active == True,
                 Opportunity.department.isnot(None),
                 Opportunity.department != ''
-            )
-        ).group_by(Opportunity.department).order_by(
-            desc(func.count(Opportunity.id))
-        ).limit(10).all()
+            ).group_by(Opportunity.department).order_by(
+                desc(func.count(Opportunity.id))
+            ).limit(10)
+        ).all()
         
         return jsonify({
             "total_active": total_active,
@@ -254,23 +338,16 @@ def get_recent_new_opportunities():
         
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        opportunities = db.session.query(Opportunity).filter(
-            and_(
+        opportunities = db.session.execute(
+            select(Opportunity).where(
                 Opportunity.first_seen_at >= cutoff_date,
                 or_(Opportunity.status == 'new', Opportunity.status == 'active'),
                 Opportunity.is_active == True
-            )
-        ).order_by(desc(Opportunity.first_seen_at)).limit(limit).all()
+            ).order_by(desc(Opportunity.first_seen_at)).limit(limit)
+        ).scalars().all()
         
         # Convert to dict format
-        opportunities_data = []
-        for opp in opportunities:
-            opp_dict = opp.to_dict()
-            # Add computed fields for backward compatibility
-            opp_dict['category'] = opp.opportunity_type
-            opp_dict['url'] = opp.application_url
-            opp_dict['requirements'] = opp.eligibility_requirements
-            opportunities_data.append(opp_dict)
+        opportunities_data = [_opportunity_dict(opp) for opp in opportunities]
         
         return jsonify({
             "opportunities": opportunities_data,
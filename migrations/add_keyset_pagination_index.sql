@@ -0,0 +1,6 @@
+-- Migration: Add index for keyset pagination of opportunities
+-- Run this in your Supabase SQL Editor or PostgreSQL database
+
+-- Newest-first browsing filters on is_active and pages by (scraped_at, id);
+-- the btree is scanned backwards for the DESC ordering
+CREATE INDEX IF NOT EXISTS idx_opportunities_active_scraped_id ON public.opportunities(is_active, scraped_at, id);
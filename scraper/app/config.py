@@ -27,6 +27,20 @@ class Settings(BaseSettings):
     llm_max_tokens: int = 2000  # Token limit for parsing HTML content
     max_parsing_retries: int = 2
     parsing_timeout: int = 45
+    llm_clean_profile: str = "aggressive"  # HTML cleanup before prompting: "slim" or "aggressive"
+    enable_llm_cache: bool = True  # Reuse parses of unchanged pages (stored in Redis)
+    llm_cache_ttl: int = 7 * 24 * 3600  # Seconds a cached parse stays valid
+    llm_similar_cache_threshold: float = 0.95  # Reuse a URL's last parse when its text is this similar (>1 disables)
+    llm_requests_per_minute: int = 30  # Client-side RPM cap for the Gemini model
+    llm_tokens_per_minute: int = 15000  # Client-side input TPM cap (estimated at 4 chars per token)
+    llm_max_concurrency: int = 8  # Concurrent Gemini calls in per-page batch parsing
+    llm_pack_page_chars: int = 1500  # Cleaned pages up to this size share a prompt in batch parsing
+    llm_pack_max_pages: int = 6  # Pages per shared prompt (1 disables packing)
+    llm_pack_max_chars: int = 20000  # Total cleaned text per shared prompt
+    llm_use_batch_api: bool = False  # Submit large batches through the Gemini Batch API
+    llm_batch_min_items: int = 20  # Smaller batches use the per-page path
+    llm_batch_poll_interval: int = 30  # Seconds between batch job status checks
+    llm_batch_timeout: int = 3600  # Give up on a batch job (and fall back) after this many seconds
 
     # Google Gemini API settings
     gemini_api_key: Optional[str] = Field(default=None, env="GEMINI_API_KEY")
@@ -45,7 +59,12 @@ class Settings(BaseSettings):
     max_retries: int = 3
     request_timeout: int = 30
     max_concurrent_requests: int = 5  # Maximum concurrent scraping requests
+    max_requests_per_host: int = 2  # Concurrent scrapes allowed against a single host
+    db_batch_urls: int = 10  # URLs whose results are saved together in one transaction
     user_agent: str = "Stanford Research Opportunities Bot/1.0"
+    enable_http_cache: bool = False  # Cache fetched pages on disk and revalidate with ETag/Last-Modified
+    http_cache_path: str = "http_cache"  # SQLite file used by the HTTP cache
+    http_cache_expire_hours: int = 6
     
     # Target websites for scraping - Updated to focus on specific opportunities
     target_websites: List[str] = [
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Text, Date, Boolean, 
-    TIMESTAMP, ForeignKey, ARRAY, func, Float, JSON
+    TIMESTAMP, ForeignKey, ARRAY, func, Float, JSON, Index
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -15,6 +15,12 @@ class Opportunity(Base):
     """Research funding and internship opportunities."""
     
     __tablename__ = "opportunities"
+    __table_args__ = (
+        # GIN index so full-text queries on search_vector avoid sequential scans
+        Index("idx_opportunities_search_vector", "search_vector", postgresql_using="gin"),
+        # Serves newest-first keyset pagination over active opportunities
+        Index("idx_opportunities_active_scraped_id", "is_active", "scraped_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(Text, nullable=False)
@@ -3,11 +3,12 @@ import time
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional, Any
 from urllib.parse import urljoin, urlparse
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import re
 import os
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -17,6 +18,12 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -27,19 +34,51 @@ from ..services.llm_validation_service import llm_parsing_service
 class BaseScraper(ABC):
     """Base class for all Stanford website scrapers."""
     
-    def __init__(self, url: str, config: Optional[Dict] = None):
-        """Initialize the scraper with URL and configuration."""
+    def __init__(self, url: str, config: Optional[Dict] = None,
+                 session: Optional[requests.Session] = None, http_session: Any = None):
+        """Initialize the scraper with URL and configuration.
+        
+        A shared requests session and aiohttp session may be passed in so that
+        scrapers created for one crawl reuse keep-alive connections and DNS lookups.
+        """
         self.url = url
         self.domain = urlparse(url).netloc
         self.config = config or SCRAPING_CONFIGS.get(self.domain, {})
-        self.session = requests.Session()
+        self.session = session or self.build_session()
+        self.http_session = http_session  # Shared aiohttp.ClientSession for async fetches, if any
         self.driver = None
         
         # Check if Selenium is disabled
         self.selenium_disabled = os.getenv('DISABLE_SELENIUM', '').lower() == 'true'
         
+        logger.info(f"Initialized scraper for {self.domain}")
+    
+    @staticmethod
+    def build_session(pool_size: Optional[int] = None) -> requests.Session:
+        """Create a requests session with the scraper's default headers.
+        
+        With HTTP caching enabled, pages are kept on disk and stale entries are
+        revalidated with If-None-Match/If-Modified-Since, so unchanged pages come back as 304s.
+        """
+        if settings.enable_http_cache and REQUESTS_CACHE_AVAILABLE:
+            session = requests_cache.CachedSession(
+                settings.http_cache_path,
+                backend='sqlite',
+                expire_after=timedelta(hours=settings.http_cache_expire_hours),
+                cache_control=True,
+            )
+        else:
+            if settings.enable_http_cache:
+                logger.warning("HTTP cache enabled but requests-cache is not installed; fetching without cache")
+            session = requests.Session()
+        
+        if pool_size:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        
         # Configure session headers
-        self.session.headers.update({
+        session.headers.update({
             'User-Agent': settings.user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
@@ -48,7 +87,7 @@ class BaseScraper(ABC):
             'Upgrade-Insecure-Requests': '1'
         })
         
-        logger.info(f"Initialized scraper for {self.domain}")
+        return session
     
     def setup_selenium_driver(self) -> Optional[webdriver.Chrome]:
         """Setup and return a Chrome WebDriver instance, or None if not available."""
@@ -109,6 +148,11 @@ class BaseScraper(ABC):
         )
         response.raise_for_status()
         
+        if getattr(response, 'from_cache', False):
+            # Unchanged page: skip the politeness delay, no body was downloaded
+            logger.info(f"Serving {url} from HTTP cache")
+            return response.text
+        
         # Add delay to be respectful
         time.sleep(self.config.get('delay', settings.scraping_delay))
         
@@ -291,8 +335,8 @@ class BaseScraper(ABC):
         logger.info(f"Starting scrape of {self.url}")
         
         try:
-            # Fetch the page
-            html = self.fetch_page(self.url)
+            # Fetch the page in a worker thread so concurrent scrapes overlap their network waits
+            html = await asyncio.to_thread(self.fetch_page, self.url)
             
             # Use LLM HTML parsing if enabled, otherwise fall back to traditional scraping
             if settings.enable_llm_parsing and settings.gemini_api_key:
@@ -339,14 +383,14 @@ class BaseScraper(ABC):
             logger.info("Using traditional scraping method...")
             
             # Parse HTML
-            soup = self.parse_html(html)
+            soup = await asyncio.to_thread(self.parse_html, html)
             
-            # Extract opportunities using the subclass implementation
-            extract_method = self.extract_opportunities(soup)
-            if asyncio.iscoroutine(extract_method):
-                opportunities = await extract_method
+            # Extract opportunities using the subclass implementation; synchronous
+            # extractors run in a worker thread so they don't stall other scrapes
+            if asyncio.iscoroutinefunction(self.extract_opportunities):
+                opportunities = await self.extract_opportunities(soup)
             else:
-                opportunities = extract_method
+                opportunities = await asyncio.to_thread(self.extract_opportunities, soup)
             
             # Add metadata for traditional scraping
             for opp in opportunities:
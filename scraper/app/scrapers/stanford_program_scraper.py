@@ -1,22 +1,136 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin, urlparse
 import re
 import asyncio
 import aiohttp
+import soupsieve as sv
 
 from .base_scraper import BaseScraper
 from loguru import logger
 
 
+# Hrefs that point at application pages or forms
+_APPLY_HREF_RE = re.compile(r'apply|application|form', re.IGNORECASE)
+_APPLY_ONLY_HREF_RE = re.compile(r'apply|application', re.IGNORECASE)
+
+# Table headers naming the deadline / apply columns, matched on whole words
+_DEADLINE_HEADER_RE = re.compile(r'\b(?:deadlines?|due)\b')
+_APPLY_HEADER_RE = re.compile(r'\b(?:apply|applications?|links?)\b')
+
+# Prominent application links and buttons, matched in a single select()
+_APP_LINK_SELECTOR = sv.compile(
+    'a[href*="apply"], a[href*="application"], a[href*="form"], '
+    'a[href*="submit"], a[href*="register"], a[href*="signup"], '
+    '.apply-btn, .application-btn, .apply-button, .application-button, '
+    '[class*="apply"], [class*="application"]'
+)
+
+# Selectors evaluated per block/row, compiled once
+_HEADING_SELECTOR = sv.compile('h1, h2, h3, h4, h5, h6')
+_STRONG_SELECTOR = sv.compile('strong, b')
+_ROW_SELECTOR = sv.compile('tr')
+_CELL_SELECTOR = sv.compile('td, th')
+_LIST_ITEM_SELECTOR = sv.compile('li')
+
+# Keywords that indicate promising links
+_PROMISING_LINK_RE = re.compile(
+    r'apply|application|deadline|form|submit|opportunity|position|internship'
+    r'|fellowship|program|research|project|stipend|funding',
+    re.IGNORECASE
+)
+_LIST_ITEM_KEYWORDS_RE = re.compile(r'deadline|apply|application|opportunity|position|internship', re.IGNORECASE)
+
+_EMBEDDED_APPLY_URL_RE = re.compile(r'https?://[^\s"\'<>]+(?:apply|application|form)')
+_DOLLAR_RANGE_TITLE_RE = re.compile(r'^\$[\d,]+\s*-\s*\$[\d,]+.*$')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+_DEADLINE_KEYWORD_PATTERNS = [
+    re.compile(keyword, re.IGNORECASE)
+    for keyword in ('deadline', 'due date', 'apply by', 'application due', 'submit by')
+]
+
+_INTERNSHIP_RE = re.compile(r'intern(?:ship)?', re.IGNORECASE)
+_FUNDING_TYPE_RE = re.compile(r'funding|grant|scholarship|fellowship', re.IGNORECASE)
+
+# (URL keywords, program-name keywords, department), checked in order
+_DEPARTMENT_RULES = (
+    (('curis',), ('computer science',), 'Computer Science'),
+    (('bio-x', 'biox'), (), 'Bio-X'),
+    (('med.stanford',), (), 'Medicine'),
+    (('mse',), ('materials',), 'Materials Science'),
+    (('aa.stanford',), ('aeronautics',), 'Aeronautics & Astronautics'),
+    (('ee.stanford',), ('electrical',), 'Electrical Engineering'),
+    (('biology',), ('biology',), 'Biology'),
+    (('epic',), ('epic',), 'Environment & Sustainability'),
+    (('siepr',), ('economics',), 'Economics'),
+    (('fsi',), ('freeman spogli',), 'International Studies'),
+    (('sgs',), ('global studies',), 'Global Studies'),
+    (('healthcare',), ('healthcare',), 'Healthcare'),
+    ((), ('humanities',), 'Humanities'),
+)
+
+_MONTHS = 'january|february|march|april|may|june|july|august|september|october|november|december'
+
+# Cheap prefilter: every deadline pattern below needs one of these literals
+_DEADLINE_HINT_RE = re.compile(r'deadline|due|apply by|submit by', re.IGNORECASE)
+
+# Each alternative captures exactly one group, so match.lastindex identifies the value
+_DEADLINE_RE = re.compile(
+    r'deadline[:\s]*([^.]*(?:' + _MONTHS + r')[^.]*)'
+    r'|due[:\s]*([^.]*\d{1,2}/\d{1,2}/\d{4}[^.]*)'
+    r'|apply by[:\s]*([^.]*)'
+    r'|application deadline[:\s]*([^.]*)'
+    r'|submissions? due[:\s]*([^.]*)',
+    re.IGNORECASE
+)
+
+_PAGE_DEADLINE_RE = re.compile(
+    # Standard date formats
+    r'(?:deadline|due|apply by|submit by)[:\s]*([^.]*(?:' + _MONTHS + r')[^.]*\d{4})'
+    r'|(?:deadline|due|apply by)[:\s]*(\d{1,2}/\d{1,2}/\d{4})'
+    r'|(?:deadline|due|apply by)[:\s]*(\d{1,2}-\d{1,2}-\d{4})'
+    # Academic deadlines
+    r'|applications?\s+due[:\s]*([^.]*(?:' + _MONTHS + r')[^.]*)'
+    r'|submission\s+deadline[:\s]*([^.]*)'
+    # Specific academic terms
+    r'|(?:fall|spring|summer|winter)\s+(?:quarter|semester)?\s+deadline[:\s]*([^.]*)',
+    re.IGNORECASE
+)
+
+_FUNDING_RE = re.compile(
+    r'\$\s?([0-9,]+(?:\.[0-9]{2})?)'
+    r'|stipend[:\s]*\$?([0-9,]+)'
+    r'|funding[:\s]*\$?([0-9,]+)'
+    r'|award[:\s]*\$?([0-9,]+)',
+    re.IGNORECASE
+)
+
+# Boilerplate that leaks into titles scraped from page chrome; the markers gate the patterns
+_TITLE_CLEANUP_MARKERS = ('skip to', 'navigate to', 'stanford university')
+_TITLE_CLEANUP_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'^Skip to.*?content\s*',
+        r'^Navigate to.*?\s*',
+        r'\s*Skip to main content\s*',
+        r'\s*Stanford University\s*',
+    )
+]
+
+
 class StanfordProgramScraper(BaseScraper):
     """Aggressive scraper for Stanford research programs that digs deep to find specific opportunities with application links."""
     
-    def __init__(self, url: str):
-        super().__init__(url)
+    def __init__(self, url: str, **kwargs):
+        super().__init__(url, **kwargs)
         self.explored_urls = set()  # Track explored URLs to avoid infinite loops
         self.max_depth = 2  # Maximum depth to explore
+        self.max_sub_pages = 10  # Total sub-page budget per crawl
+        self.sub_page_workers = 4  # Concurrent sub-page fetchers
+        self.max_sub_page_bytes = 2 * 1024 * 1024  # Stop reading sub-pages beyond 2 MB
+        self.max_page_text_chars = 200_000  # Cap on text scanned by page-wide regex passes
         self.user_agent = self.session.headers.get('User-Agent', 'Stanford Research Bot/1.0')  # Fix user_agent issue
+        self._department = None  # Resolved lazily by the department property
         
     async def extract_opportunities(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """Extract specific research opportunities by aggressively searching for actionable content."""
@@ -97,7 +211,7 @@ class StanfordProgramScraper(BaseScraper):
         return opportunities
     
     async def _extract_from_sub_pages(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
-        """Follow links to find opportunities on sub-pages."""
+        """Follow links to find opportunities on sub-pages, crawling up to max_depth levels."""
         opportunities = []
         
         try:
@@ -106,23 +220,39 @@ class StanfordProgramScraper(BaseScraper):
             
             logger.info(f"Found {len(promising_links)} promising links to explore")
             
+            if not promising_links:
+                return opportunities
+            
+            # Seed the crawl queue with (link_info, depth) pairs
+            queue = asyncio.Queue()
+            for link_info in promising_links:
+                queue.put_nowait((link_info, 1))
+            
+            async def worker():
+                while True:
+                    link_info, depth = await queue.get()
+                    try:
+                        if len(self.explored_urls) < self.max_sub_pages:
+                            sub_opportunities, child_links = await self._scrape_sub_page(link_info)
+                            opportunities.extend(sub_opportunities)
+                            
+                            # Keep feeding the pool instead of waiting for the whole level
+                            if depth < self.max_depth:
+                                for child_link in child_links:
+                                    queue.put_nowait((child_link, depth + 1))
+                    except Exception as e:
+                        logger.error(f"Error crawling sub-page {link_info.get('url')}: {e}")
+                    finally:
+                        queue.task_done()
+            
             # Limit concurrent requests to avoid overwhelming servers
-            semaphore = asyncio.Semaphore(2)
-            
-            async def scrape_sub_page(link_info):
-                async with semaphore:
-                    return await self._scrape_sub_page(link_info)
-            
-            # Scrape sub-pages concurrently
-            if promising_links:
-                sub_page_results = await asyncio.gather(
-                    *[scrape_sub_page(link) for link in promising_links[:5]],  # Limit to 5 sub-pages
-                    return_exceptions=True
-                )
-                
-                for result in sub_page_results:
-                    if isinstance(result, list):
-                        opportunities.extend(result)
+            workers = [asyncio.create_task(worker()) for _ in range(self.sub_page_workers)]
+            try:
+                await queue.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
                         
         except Exception as e:
             logger.error(f"Error extracting from sub-pages: {e}")
@@ -134,35 +264,39 @@ class StanfordProgramScraper(BaseScraper):
         opportunities = []
         
         try:
+            # Only iframes/scripts that mention an application can yield anything
+            iframes = soup.find_all('iframe', src=_APPLY_HREF_RE)
+            scripts = soup.find_all('script', string=_APPLY_HREF_RE)
+            if not iframes and not scripts:
+                return opportunities
+            
             # Look for iframes that might contain application forms
-            iframes = soup.select('iframe')
             for iframe in iframes:
                 src = iframe.get('src')
-                if src and any(keyword in src.lower() for keyword in ['apply', 'form', 'application']):
+                if src:
                     opp = {
-                        'title': f"Application Form - {self._determine_department()}",
-                        'description': f"Online application form for {self._determine_department()} programs",
+                        'title': f"Application Form - {self.department}",
+                        'description': f"Online application form for {self.department} programs",
                         'application_url': urljoin(self.url, src),
                         'source_url': self.url,
-                        'department': self._determine_department(),
+                        'department': self.department,
                         'opportunity_type': 'research',
                         'tags': ['application', 'form']
                     }
                     opportunities.append(opp)
             
             # Look for JavaScript-embedded content
-            scripts = soup.select('script')
             for script in scripts:
                 if script.string:
                     # Look for embedded URLs or data
-                    urls = re.findall(r'https?://[^\s"\'<>]+(?:apply|application|form)', script.string)
+                    urls = _EMBEDDED_APPLY_URL_RE.findall(script.string)
                     for url in urls:
                         opp = {
-                            'title': f"Embedded Application - {self._determine_department()}",
+                            'title': f"Embedded Application - {self.department}",
                             'description': f"Application link found in page scripts",
                             'application_url': url,
                             'source_url': self.url,
-                            'department': self._determine_department(),
+                            'department': self.department,
                             'opportunity_type': 'research',
                             'tags': ['embedded', 'application']
                         }
@@ -201,66 +335,95 @@ class StanfordProgramScraper(BaseScraper):
         
         return opportunities
     
-    def _find_promising_links(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def _find_promising_links(self, soup: BeautifulSoup, base_url: str = None) -> List[Dict[str, str]]:
         """Find links that are likely to contain specific opportunities."""
         promising_links = []
+        base_url = base_url or self.url
         
-        # Keywords that indicate promising links
-        promising_keywords = [
-            'apply', 'application', 'deadline', 'form', 'submit',
-            'opportunity', 'position', 'internship', 'fellowship',
-            'program', 'research', 'project', 'stipend', 'funding'
-        ]
-        
+        base_netloc = urlparse(base_url).netloc
+        seen_urls = set()
         links = soup.select('a[href]')
         for link in links:
             href = link.get('href')
-            text = link.get_text(strip=True).lower()
-            title = link.get('title', '').lower()
+            if not href or href.startswith('mailto:'):
+                continue
             
-            if href and not href.startswith('mailto:'):
-                # Check if link text or title contains promising keywords
-                if any(keyword in text or keyword in title for keyword in promising_keywords):
-                    full_url = urljoin(self.url, href)
-                    
-                    # Only follow Stanford links
-                    if 'stanford' in full_url and full_url not in self.explored_urls:
-                        promising_links.append({
-                            'url': full_url,
-                            'text': link.get_text(strip=True),
-                            'context': text
-                        })
+            text = link.get_text(strip=True)
+            
+            # Check if link text or title contains promising keywords
+            if not (_PROMISING_LINK_RE.search(text) or _PROMISING_LINK_RE.search(link.get('title', ''))):
+                continue
+            
+            full_url = urljoin(base_url, href)
+            if full_url in seen_urls or full_url in self.explored_urls:
+                continue
+            seen_urls.add(full_url)
+            
+            # Only follow Stanford links (or links on the site being scraped)
+            netloc = urlparse(full_url).netloc
+            if netloc == 'stanford.edu' or netloc.endswith('.stanford.edu') or netloc == base_netloc:
+                promising_links.append({
+                    'url': full_url,
+                    'text': text,
+                    'context': text.lower()
+                })
         
         return promising_links[:10]  # Limit to top 10 most promising
     
-    async def _scrape_sub_page(self, link_info: Dict[str, str]) -> List[Dict[str, Any]]:
-        """Scrape a sub-page for opportunities."""
+    async def _scrape_sub_page(self, link_info: Dict[str, str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """Scrape a sub-page for opportunities and return them with the page's own promising links."""
         opportunities = []
+        child_links = []
         url = link_info['url']
         
         if url in self.explored_urls:
-            return opportunities
+            return opportunities, child_links
         
         self.explored_urls.add(url)
         
         try:
             logger.info(f"Exploring sub-page: {url}")
             
-            # Fetch the sub-page
+            # Fetch the sub-page, reusing the crawl-wide session when one was provided
             timeout = aiohttp.ClientTimeout(total=15)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, headers={'User-Agent': self.user_agent}) as response:
+            owns_session = self.http_session is None
+            session = aiohttp.ClientSession(timeout=timeout) if owns_session else self.http_session
+            try:
+                async with session.get(url, headers={'User-Agent': self.user_agent}, timeout=timeout) as response:
                     if response.status == 200:
-                        content = await response.text()
-                        sub_soup = BeautifulSoup(content, 'html.parser')
+                        # Stream the body so oversized pages (calendars, news hubs) are cut off early
+                        content = bytearray()
+                        async for chunk in response.content.iter_chunked(16384):
+                            content.extend(chunk)
+                            if len(content) >= self.max_sub_page_bytes:
+                                logger.warning(f"Sub-page {url} exceeds {self.max_sub_page_bytes} bytes, truncating")
+                                break
                         
-                        # Look for specific application forms or deadlines
-                        opportunities = self._extract_specific_content_from_subpage(sub_soup, url, link_info)
+                        # Parse and extract in a worker thread so other fetches keep running
+                        opportunities, child_links = await asyncio.to_thread(
+                            self._parse_and_extract_sync, bytes(content), url, link_info
+                        )
+            finally:
+                if owns_session:
+                    await session.close()
                         
         except Exception as e:
             logger.error(f"Error scraping sub-page {url}: {e}")
         
-        return opportunities
+        return opportunities, child_links
+    
+    def _parse_and_extract_sync(self, content: bytes, url: str, link_info: Dict[str, str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """Parse a fetched sub-page and extract its opportunities and promising links (CPU-bound)."""
+        # Raw bytes let the parser sniff the encoding here rather than on the event loop
+        sub_soup = self.parse_html(content)
+        
+        # Look for specific application forms or deadlines
+        opportunities = self._extract_specific_content_from_subpage(sub_soup, url, link_info)
+        
+        # Collect links for the next crawl level
+        child_links = self._find_promising_links(sub_soup, base_url=url)
+        
+        return opportunities, child_links
     
     def _extract_specific_content_from_subpage(self, soup: BeautifulSoup, url: str, link_info: Dict[str, str]) -> List[Dict[str, Any]]:
         """Extract specific, actionable content from a sub-page."""
@@ -277,7 +440,7 @@ class StanfordProgramScraper(BaseScraper):
                     'description': f"Direct application form for {link_info['text']}",
                     'application_url': full_action_url,
                     'source_url': url,
-                    'department': self._determine_department(),
+                    'department': self.department,
                     'opportunity_type': self._classify_from_text(link_info['text']),
                     'tags': ['application', 'form', 'direct']
                 }
@@ -294,7 +457,7 @@ class StanfordProgramScraper(BaseScraper):
                     'application_url': url,
                     'deadline': deadline,
                     'source_url': url,
-                    'department': self._determine_department(),
+                    'department': self.department,
                     'opportunity_type': self._classify_from_text(link_info['text']),
                     'tags': ['deadline', 'specific']
                 }
@@ -311,7 +474,7 @@ class StanfordProgramScraper(BaseScraper):
                     'application_url': url,
                     'funding_amount': funding_amount,
                     'source_url': url,
-                    'department': self._determine_department(),
+                    'department': self.department,
                     'opportunity_type': self._classify_from_text(link_info['text']),
                     'tags': ['funded', 'specific']
                 }
@@ -324,10 +487,8 @@ class StanfordProgramScraper(BaseScraper):
         deadline_blocks = []
         
         # Look for elements containing deadline keywords
-        deadline_keywords = ['deadline', 'due date', 'apply by', 'application due', 'submit by']
-        
-        for keyword in deadline_keywords:
-            elements = soup.find_all(text=re.compile(keyword, re.IGNORECASE))
+        for keyword_re in _DEADLINE_KEYWORD_PATTERNS:
+            elements = soup.find_all(text=keyword_re)
             for element in elements:
                 parent = element.parent
                 if parent and parent not in deadline_blocks:
@@ -338,15 +499,15 @@ class StanfordProgramScraper(BaseScraper):
     def _find_application_link_blocks(self, soup: BeautifulSoup) -> List[Tag]:
         """Find content blocks that contain application links."""
         app_blocks = []
+        seen_blocks = set()
         
         # Look for links with application-related text
-        app_links = soup.select('a[href*="apply"], a[href*="application"], a[href*="form"]')
+        app_links = soup.find_all('a', href=_APPLY_HREF_RE)
         for link in app_links:
             # Get the surrounding context
-            parent = link.parent
-            while parent and parent.name not in ['div', 'section', 'article', 'li']:
-                parent = parent.parent
-            if parent and parent not in app_blocks:
+            parent = link.find_parent(['div', 'section', 'article', 'li'])
+            if parent is not None and id(parent) not in seen_blocks:
+                seen_blocks.add(id(parent))
                 app_blocks.append(parent)
         
         return app_blocks
@@ -360,16 +521,11 @@ class StanfordProgramScraper(BaseScraper):
         deadline = self.extract_deadline(deadline_text) if deadline_text else None
         
         # Look for application links in this block
-        app_links = block.select('a[href]')
-        app_url = ""
-        for link in app_links:
-            href = link.get('href')
-            if href and any(keyword in href.lower() for keyword in ['apply', 'application', 'form']):
-                app_url = urljoin(self.url, href)
-                break
+        app_link = block.find('a', href=_APPLY_HREF_RE)
+        app_url = urljoin(self.url, app_link['href']) if app_link else ""
         
         # Extract title from heading or strong text in block
-        title = self._extract_title_from_block(block)
+        title = self._extract_title_from_block(block, text)
         
         return {
             'title': title or f"Research Opportunity with Deadline",
@@ -377,7 +533,7 @@ class StanfordProgramScraper(BaseScraper):
             'deadline': deadline,
             'application_url': app_url,
             'source_url': self.url,
-            'department': self._determine_department(),
+            'department': self.department,
             'opportunity_type': 'research',
             'tags': ['deadline', 'time-sensitive']
         }
@@ -387,26 +543,19 @@ class StanfordProgramScraper(BaseScraper):
         text = block.get_text(strip=True)
         
         # Find the application link
-        app_links = block.select('a[href]')
-        app_url = ""
-        link_text = ""
-        
-        for link in app_links:
-            href = link.get('href')
-            if href and any(keyword in href.lower() for keyword in ['apply', 'application', 'form']):
-                app_url = urljoin(self.url, href)
-                link_text = link.get_text(strip=True)
-                break
+        app_link = block.find('a', href=_APPLY_HREF_RE)
+        app_url = urljoin(self.url, app_link['href']) if app_link else ""
+        link_text = app_link.get_text(strip=True) if app_link else ""
         
         # Extract title
-        title = self._extract_title_from_block(block) or link_text
+        title = self._extract_title_from_block(block, text) or link_text
         
         return {
             'title': title or f"Application Available",
             'description': text[:300] + "..." if len(text) > 300 else text,
             'application_url': app_url,
             'source_url': self.url,
-            'department': self._determine_department(),
+            'department': self.department,
             'opportunity_type': self._classify_from_text(text),
             'tags': ['application', 'direct-link']
         }
@@ -416,28 +565,29 @@ class StanfordProgramScraper(BaseScraper):
         opportunities = []
         
         try:
-            rows = table.select('tr')
+            rows = _ROW_SELECTOR.select(table)
             headers = []
             
             # Get headers
             header_row = table.select_one('thead tr, tr:first-child')
             if header_row:
-                headers = [th.get_text(strip=True).lower() for th in header_row.select('th, td')]
+                headers = [th.get_text(strip=True).lower() for th in _CELL_SELECTOR.select(header_row)]
+            
+            # Known layouts (Program / Deadline / Apply) get a column-indexed fast path
+            deadline_idx = self._find_header_column(headers, _DEADLINE_HEADER_RE)
+            apply_idx = self._find_header_column(headers, _APPLY_HEADER_RE)
+            if deadline_idx >= 0 or apply_idx >= 0:
+                return self._extract_from_schema_table(rows[1:], deadline_idx, apply_idx)
             
             # Process data rows
             for row in rows[1:] if headers else rows:
-                cells = row.select('td, th')
+                cells = _CELL_SELECTOR.select(row)
                 if len(cells) >= 2:  # Need at least 2 columns for meaningful data
                     row_data = [cell.get_text(strip=True) for cell in cells]
                     
                     # Look for application links in this row
-                    app_links = row.select('a[href]')
-                    app_url = ""
-                    for link in app_links:
-                        href = link.get('href')
-                        if href and any(keyword in href.lower() for keyword in ['apply', 'application']):
-                            app_url = urljoin(self.url, href)
-                            break
+                    app_link = row.find('a', href=_APPLY_ONLY_HREF_RE)
+                    app_url = urljoin(self.url, app_link['href']) if app_link else ""
                     
                     if app_url or any('deadline' in cell.lower() for cell in row_data):
                         opp = {
@@ -445,7 +595,7 @@ class StanfordProgramScraper(BaseScraper):
                             'description': " | ".join(row_data),
                             'application_url': app_url,
                             'source_url': self.url,
-                            'department': self._determine_department(),
+                            'department': self.department,
                             'opportunity_type': 'research',
                             'tags': ['table', 'structured']
                         }
@@ -464,35 +614,79 @@ class StanfordProgramScraper(BaseScraper):
         
         return opportunities
     
+    def _find_header_column(self, headers: List[str], pattern: re.Pattern) -> int:
+        """Return the index of the first header matching the pattern, or -1."""
+        for i, header in enumerate(headers):
+            if pattern.search(header):
+                return i
+        return -1
+    
+    def _extract_from_schema_table(self, rows: List[Tag], deadline_idx: int, apply_idx: int) -> List[Dict[str, Any]]:
+        """Extract opportunities from a table whose deadline/apply columns are known from its headers."""
+        opportunities = []
+        
+        for row in rows:
+            cells = _CELL_SELECTOR.select(row)
+            if len(cells) < 2:
+                continue
+            
+            row_data = [cell.get_text(strip=True) for cell in cells]
+            
+            # Prefer the apply column's link, e.g. over a linked program name
+            app_link = None
+            if 0 <= apply_idx < len(cells):
+                app_link = cells[apply_idx].find('a', href=_APPLY_ONLY_HREF_RE)
+            if app_link is None:
+                app_link = row.find('a', href=_APPLY_ONLY_HREF_RE)
+            app_url = urljoin(self.url, app_link['href']) if app_link else ""
+            
+            # Same rows as the generic scan: an application link or a deadline mention
+            if not app_url and not any('deadline' in cell.lower() for cell in row_data):
+                continue
+            
+            # Only the deadline column needs date parsing
+            deadline = None
+            if 0 <= deadline_idx < len(row_data) and row_data[deadline_idx]:
+                deadline = self.extract_deadline(row_data[deadline_idx])
+            
+            opp = {
+                'title': row_data[0],
+                'description': " | ".join(row_data),
+                'application_url': app_url,
+                'source_url': self.url,
+                'department': self.department,
+                'opportunity_type': 'research',
+                'tags': ['table', 'structured']
+            }
+            if deadline:
+                opp['deadline'] = deadline
+            
+            opportunities.append(opp)
+        
+        return opportunities
+    
     def _extract_from_list(self, list_elem: Tag) -> List[Dict[str, Any]]:
         """Extract opportunities from list elements."""
         opportunities = []
         
         try:
-            items = list_elem.select('li')
+            items = _LIST_ITEM_SELECTOR.select(list_elem)
             for item in items:
                 item_text = item.get_text(strip=True)
                 
                 # Look for application links
-                app_links = item.select('a[href]')
-                app_url = ""
-                for link in app_links:
-                    href = link.get('href')
-                    if href and any(keyword in href.lower() for keyword in ['apply', 'application', 'form']):
-                        app_url = urljoin(self.url, href)
-                        break
+                app_link = item.find('a', href=_APPLY_HREF_RE)
+                app_url = urljoin(self.url, app_link['href']) if app_link else ""
                 
                 # Check if this list item contains opportunity-relevant information
-                if (app_url or 
-                    any(keyword in item_text.lower() for keyword in 
-                        ['deadline', 'apply', 'application', 'opportunity', 'position', 'internship'])):
+                if app_url or _LIST_ITEM_KEYWORDS_RE.search(item_text):
                     
                     opp = {
                         'title': item_text[:100] + "..." if len(item_text) > 100 else item_text,
                         'description': item_text,
                         'application_url': app_url,
                         'source_url': self.url,
-                        'department': self._determine_department(),
+                        'department': self.department,
                         'opportunity_type': self._classify_from_text(item_text),
                         'tags': ['list', 'structured']
                     }
@@ -523,13 +717,8 @@ class StanfordProgramScraper(BaseScraper):
                     def_text = definitions[i].get_text(strip=True)
                     
                     # Look for application links in definition
-                    app_links = definitions[i].select('a[href]')
-                    app_url = ""
-                    for link in app_links:
-                        href = link.get('href')
-                        if href and any(keyword in href.lower() for keyword in ['apply', 'application']):
-                            app_url = urljoin(self.url, href)
-                            break
+                    app_link = definitions[i].find('a', href=_APPLY_ONLY_HREF_RE)
+                    app_url = urljoin(self.url, app_link['href']) if app_link else ""
                     
                     if app_url or 'deadline' in def_text.lower():
                         opp = {
@@ -537,7 +726,7 @@ class StanfordProgramScraper(BaseScraper):
                             'description': def_text,
                             'application_url': app_url,
                             'source_url': self.url,
-                            'department': self._determine_department(),
+                            'department': self.department,
                             'opportunity_type': self._classify_from_text(term_text + " " + def_text),
                             'tags': ['definition', 'structured']
                         }
@@ -573,7 +762,7 @@ class StanfordProgramScraper(BaseScraper):
             return False
         
         # Must have meaningful title (not just dollar amounts)
-        if re.match(r'^\$[\d,]+\s*-\s*\$[\d,]+.*$', title.strip()):
+        if _DOLLAR_RANGE_TITLE_RE.match(title.strip()):
             return False  # Skip titles that are just dollar ranges
         
         # Require at least one actionable piece of information
@@ -641,20 +830,21 @@ class StanfordProgramScraper(BaseScraper):
         
         return score
     
-    def _extract_title_from_block(self, block: Tag) -> str:
-        """Extract a meaningful title from a content block."""
+    def _extract_title_from_block(self, block: Tag, text: str = None) -> str:
+        """Extract a meaningful title from a content block (text is the block's stripped text, if already known)."""
         # Try to find headings first
-        headings = block.select('h1, h2, h3, h4, h5, h6')
+        headings = _HEADING_SELECTOR.select(block)
         if headings:
             return headings[0].get_text(strip=True)
         
         # Try strong/bold text
-        strong_text = block.select('strong, b')
+        strong_text = _STRONG_SELECTOR.select(block)
         if strong_text:
             return strong_text[0].get_text(strip=True)
         
         # Fall back to first sentence
-        text = block.get_text(strip=True)
+        if text is None:
+            text = block.get_text(strip=True)
         sentences = text.split('.')
         if sentences:
             return sentences[0].strip()
@@ -663,122 +853,97 @@ class StanfordProgramScraper(BaseScraper):
     
     def _extract_deadline_text_from_block(self, text: str) -> str:
         """Extract deadline text from a block of text."""
-        deadline_patterns = [
-            r'deadline[:\s]*([^.]*(?:january|february|march|april|may|june|july|august|september|october|november|december)[^.]*)',
-            r'due[:\s]*([^.]*\d{1,2}/\d{1,2}/\d{4}[^.]*)',
-            r'apply by[:\s]*([^.]*)',
-            r'application deadline[:\s]*([^.]*)',
-            r'submissions? due[:\s]*([^.]*)'
-        ]
-        
-        for pattern in deadline_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
+        if not _DEADLINE_HINT_RE.search(text):
+            return ""
         
-        return ""
+        match = _DEADLINE_RE.search(text)
+        return match.group(match.lastindex).strip() if match else ""
     
     def _extract_deadline_from_page(self, soup: BeautifulSoup) -> str:
         """Extract deadline information from a page."""
-        text = soup.get_text()
+        text = self._get_page_text(soup)
         return self._extract_deadline_text_from_block(text)
     
     def _extract_funding_from_page(self, soup: BeautifulSoup) -> str:
         """Extract funding information from a page."""
-        text = soup.get_text()
-        
-        funding_patterns = [
-            r'\$\s?([0-9,]+(?:\.[0-9]{2})?)',
-            r'stipend[:\s]*\$?([0-9,]+)',
-            r'funding[:\s]*\$?([0-9,]+)',
-            r'award[:\s]*\$?([0-9,]+)'
-        ]
-        
-        for pattern in funding_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return f"${match.group(1)}"
-        
-        return ""
+        return self._extract_funding_from_text(self._get_page_text(soup))
+    
+    def _get_page_text(self, soup: BeautifulSoup) -> str:
+        """Collect the page's visible strings, stopping once max_page_text_chars is reached."""
+        chunks = []
+        total = 0
+        for chunk in soup.stripped_strings:
+            chunks.append(chunk)
+            total += len(chunk) + 1
+            if total >= self.max_page_text_chars:
+                break
+        return ' '.join(chunks)
+    
+    def _extract_funding_from_text(self, text: str) -> str:
+        """Extract funding information from a block of text."""
+        match = _FUNDING_RE.search(text)
+        return f"${match.group(match.lastindex)}" if match else ""
     
     def _classify_from_text(self, text: str) -> str:
         """Classify opportunity type from text content."""
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['internship', 'intern']):
+        if _INTERNSHIP_RE.search(text):
             return 'internship'
-        elif any(word in text_lower for word in ['funding', 'grant', 'scholarship', 'fellowship']):
+        elif _FUNDING_TYPE_RE.search(text):
             return 'funding'
         else:
             return 'research'
     
+    @property
+    def department(self) -> str:
+        """Department for this scraper's URL; invariant per instance, so computed once."""
+        if self._department is None:
+            self._department = self._determine_department()
+        return self._department
+    
     def _determine_department(self) -> str:
         """Determine the department based on URL and configuration."""
         program_name = self.config.get('name', '')
+        url_lower = self.url.lower()
+        name_lower = program_name.lower()
         
-        # Map program names to departments
-        if 'curis' in self.url.lower() or 'computer science' in program_name.lower():
-            return 'Computer Science'
-        elif 'bio-x' in self.url.lower() or 'biox' in self.url.lower():
-            return 'Bio-X'
-        elif 'med.stanford' in self.url:
-            return 'Medicine'
-        elif 'mse' in self.url or 'materials' in program_name.lower():
-            return 'Materials Science'
-        elif 'aa.stanford' in self.url or 'aeronautics' in program_name.lower():
-            return 'Aeronautics & Astronautics'
-        elif 'ee.stanford' in self.url or 'electrical' in program_name.lower():
-            return 'Electrical Engineering'
-        elif 'biology' in self.url or 'biology' in program_name.lower():
-            return 'Biology'
-        elif 'epic' in self.url.lower() or 'epic' in program_name.lower():
-            return 'Environment & Sustainability'
-        elif 'siepr' in self.url or 'economics' in program_name.lower():
-            return 'Economics'
-        elif 'fsi' in self.url or 'freeman spogli' in program_name.lower():
-            return 'International Studies'
-        elif 'sgs' in self.url or 'global studies' in program_name.lower():
-            return 'Global Studies'
-        elif 'healthcare' in self.url or 'healthcare' in program_name.lower():
-            return 'Healthcare'
-        elif 'humanities' in program_name.lower():
-            return 'Humanities'
-        else:
-            return program_name or 'Stanford Research'
+        # First rule whose URL or program-name keyword matches wins
+        for url_keywords, name_keywords, department in _DEPARTMENT_RULES:
+            if any(keyword in url_lower for keyword in url_keywords) or any(keyword in name_lower for keyword in name_keywords):
+                return department
+        
+        return program_name or 'Stanford Research'
     
     def _extract_opportunity_from_element(self, element: Tag) -> Dict[str, Any]:
         """Extract opportunity data from a specific HTML element."""
         try:
+            # Walk the element's text once and share it between the helpers; the
+            # space-joined form keeps adjacent nodes (e.g. "$5,000" and "2025") apart
+            strings = list(element.stripped_strings)
+            description = ''.join(strings)
+            spaced_text = ' '.join(strings)
+            
             # Extract title
-            title = self._extract_title_from_block(element)
+            title = self._extract_title_from_block(element, description)
             if not title:
                 return {}
             
             # Clean and shorten title
             title = self._clean_title(title)
             
-            # Extract description
-            description = element.get_text(strip=True)
-            
             # Extract application URL
-            app_links = element.select('a[href]')
-            application_url = ""
-            for link in app_links:
-                href = link.get('href')
-                if href and any(keyword in href.lower() for keyword in ['apply', 'application', 'form']):
-                    application_url = urljoin(self.url, href)
-                    break
+            app_link = element.find('a', href=_APPLY_HREF_RE)
+            application_url = urljoin(self.url, app_link['href']) if app_link else ""
             
             # Extract deadline
-            deadline_text = self._extract_deadline_text_from_block(description)
+            deadline_text = self._extract_deadline_text_from_block(spaced_text)
             deadline = self.extract_deadline(deadline_text) if deadline_text else None
             
             # Extract funding
-            funding_text = self._extract_funding_from_page(BeautifulSoup(str(element), 'html.parser'))
+            funding_text = self._extract_funding_from_text(spaced_text)
             funding_amount = self.extract_funding_amount(funding_text) if funding_text else None
             
             # Determine department
-            department = self._determine_department()
+            department = self.department
             
             # Generate tags and classify type
             tags = self.extract_tags(title, description)
@@ -817,56 +982,47 @@ class StanfordProgramScraper(BaseScraper):
             else:
                 title = title[:100] + "..."
         
-        # Remove redundant text patterns
-        cleanup_patterns = [
-            r'^Skip to.*?content\s*',
-            r'^Navigate to.*?\s*',
-            r'\s*Skip to main content\s*',
-            r'\s*Stanford University\s*',
-        ]
-        
-        for pattern in cleanup_patterns:
-            title = re.sub(pattern, '', title, flags=re.IGNORECASE)
+        # Remove redundant text patterns (titles are short, so a lowercase copy is cheap)
+        title_lower = title.lower()
+        if any(marker in title_lower for marker in _TITLE_CLEANUP_MARKERS):
+            for pattern in _TITLE_CLEANUP_PATTERNS:
+                title = pattern.sub('', title)
         
         # Clean up extra whitespace
-        title = re.sub(r'\s+', ' ', title).strip()
+        title = _WHITESPACE_RE.sub(' ', title).strip()
         
         return title
     
     def _extract_prominent_application_links(self, soup: BeautifulSoup, opportunities: List[Dict[str, Any]]) -> None:
         """Look for prominent application links anywhere on the page."""
         try:
-            # Look for application links with common patterns
-            app_link_patterns = [
-                'a[href*="apply"]', 'a[href*="application"]', 'a[href*="form"]',
-                'a[href*="submit"]', 'a[href*="register"]', 'a[href*="signup"]',
-                '.apply-btn', '.application-btn', '.apply-button', '.application-button',
-                '[class*="apply"]', '[class*="application"]'
-            ]
+            seen_urls = {opp.get('application_url') for opp in opportunities}
             
-            for pattern in app_link_patterns:
-                links = soup.select(pattern)
-                for link in links:
-                    href = link.get('href')
-                    if href:
-                        full_url = urljoin(self.url, href)
-                        link_text = link.get_text(strip=True)
-                        
-                        # Create opportunity from application link
-                        if link_text and len(link_text) > 3:  # Meaningful link text
-                            opp = {
-                                'title': f"{link_text} - {self._determine_department()}",
-                                'description': f"Application link found: {link_text}",
-                                'application_url': full_url,
-                                'source_url': self.url,
-                                'department': self._determine_department(),
-                                'opportunity_type': self._classify_from_text(link_text),
-                                'tags': ['application', 'direct-link']
-                            }
-                            
-                            # Avoid duplicates
-                            if not any(existing_opp.get('application_url') == full_url for existing_opp in opportunities):
-                                opportunities.append(opp)
+            # Look for application links with common patterns (one document walk)
+            for link in _APP_LINK_SELECTOR.select(soup):
+                href = link.get('href')
+                if not href:
+                    continue
+                
+                full_url = urljoin(self.url, href)
+                link_text = link.get_text(strip=True)
+                
+                # Create opportunity from application link
+                if link_text and len(link_text) > 3:  # Meaningful link text
+                    opp = {
+                        'title': f"{link_text} - {self.department}",
+                        'description': f"Application link found: {link_text}",
+                        'application_url': full_url,
+                        'source_url': self.url,
+                        'department': self.department,
+                        'opportunity_type': self._classify_from_text(link_text),
+                        'tags': ['application', 'direct-link']
+                    }
+                    
+                    # Avoid duplicates
+                    if full_url not in seen_urls:
+                        seen_urls.add(full_url)
+                        opportunities.append(opp)
                                 
         except Exception as e:
             logger.error(f"Error extracting prominent application links: {e}")
@@ -874,42 +1030,32 @@ class StanfordProgramScraper(BaseScraper):
     def _extract_deadline_text_anywhere(self, soup: BeautifulSoup, opportunities: List[Dict[str, Any]]) -> None:
         """Look for deadline text anywhere on the page and create opportunities."""
         try:
-            page_text = soup.get_text()
-            
-            # Enhanced deadline patterns
-            deadline_patterns = [
-                # Standard date formats
-                r'(?:deadline|due|apply by|submit by)[:\s]*([^.]*(?:january|february|march|april|may|june|july|august|september|october|november|december)[^.]*\d{4})',
-                r'(?:deadline|due|apply by)[:\s]*(\d{1,2}/\d{1,2}/\d{4})',
-                r'(?:deadline|due|apply by)[:\s]*(\d{1,2}-\d{1,2}-\d{4})',
-                # Academic deadlines
-                r'applications?\s+due[:\s]*([^.]*(?:january|february|march|april|may|june|july|august|september|october|november|december)[^.]*)',
-                r'submission\s+deadline[:\s]*([^.]*)',
-                # Specific academic terms
-                r'(?:fall|spring|summer|winter)\s+(?:quarter|semester)?\s+deadline[:\s]*([^.]*)',
-            ]
+            page_text = self._get_page_text(soup)
+            if not _DEADLINE_HINT_RE.search(page_text):
+                return
+            
+            seen_deadlines = {opp.get('deadline') for opp in opportunities}
             
-            for pattern in deadline_patterns:
-                matches = re.finditer(pattern, page_text, re.IGNORECASE)
-                for match in matches:
-                    deadline_text = match.group(1).strip()
-                    deadline_date = self.extract_deadline(deadline_text)
+            for match in _PAGE_DEADLINE_RE.finditer(page_text):
+                deadline_text = match.group(match.lastindex).strip()
+                deadline_date = self.extract_deadline(deadline_text)
+                
+                if deadline_date:
+                    # Create opportunity with specific deadline
+                    opp = {
+                        'title': f"Application Deadline - {self.department}",
+                        'description': f"Research opportunity with deadline: {deadline_text}",
+                        'deadline': deadline_date,
+                        'source_url': self.url,
+                        'department': self.department,
+                        'opportunity_type': 'research',
+                        'tags': ['deadline', 'time-sensitive']
+                    }
+                    
+                    # Avoid duplicates
+                    if deadline_date not in seen_deadlines:
+                        seen_deadlines.add(deadline_date)
+                        opportunities.append(opp)
                     
-                    if deadline_date:
-                        # Create opportunity with specific deadline
-                        opp = {
-                            'title': f"Application Deadline - {self._determine_department()}",
-                            'description': f"Research opportunity with deadline: {deadline_text}",
-                            'deadline': deadline_date,
-                            'source_url': self.url,
-                            'department': self._determine_department(),
-                            'opportunity_type': 'research',
-                            'tags': ['deadline', 'time-sensitive']
-                        }
-                        
-                        # Avoid duplicates
-                        if not any(existing_opp.get('deadline') == deadline_date for existing_opp in opportunities):
-                            opportunities.append(opp)
-                        
         except Exception as e:
-            logger.error(f"Error extracting deadline text: {e}") 
\ No newline at end of file
+            logger.error(f"Error extracting deadline text: {e}")
@@ -1,11 +1,31 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin
+import re
+import soupsieve as sv
 
 from .base_scraper import BaseScraper
 from loguru import logger
 
 
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_SECTION_DELIMITERS = ('\n\n', '***', '---', '===')  # Checked in priority order
+_OPPORTUNITY_KEYWORDS_RE = re.compile(r'fund|grant|award|opportunity|program|fellowship', re.IGNORECASE)
+
+# Header keywords that mark a funding opportunity section
+_OPPORTUNITY_HEADER_KEYWORDS = ('funding', 'grant', 'award', 'opportunity', 'program')
+
+# Field selectors, compiled once and each evaluated as one union in a single subtree walk
+_TITLE_SELECTOR = sv.compile('h1, h2, h3, h4, .title, .heading, .name')
+_DESCRIPTION_SELECTOR = sv.compile('.description, .content, .details, .summary, p, .text, .info')
+_DEADLINE_SELECTOR = sv.compile('.deadline, .due-date, .apply-by, [class*="deadline"], [class*="due"], .date')
+_AMOUNT_SELECTOR = sv.compile('.amount, .funding, .award, .stipend, [class*="amount"], [class*="funding"]')
+_ELIGIBILITY_SELECTOR = sv.compile('.eligibility, .requirements, .criteria, [class*="eligibility"], [class*="requirement"]')
+_APPLICATION_SELECTOR = sv.compile('a[href*="apply"], a[href*="application"], .apply-link, .application-link, [class*="apply"]')
+_MAILTO_SELECTOR = sv.compile('a[href^="mailto:"]')
+_DEPARTMENT_SELECTOR = sv.compile('.department, .dept, .school, .division, [class*="department"], [class*="dept"]')
+
+
 class UndergradResearchScraper(BaseScraper):
     """Scraper for Stanford Undergraduate Research funding opportunities."""
     
@@ -37,10 +57,7 @@ class UndergradResearchScraper(BaseScraper):
             # If no specific containers found, look for structured content
             if not opportunity_elements:
                 # Look for headers that might indicate funding opportunities
-                headers = soup.find_all(['h2', 'h3', 'h4'], string=lambda text: text and any(
-                    keyword in text.lower() for keyword in 
-                    ['funding', 'grant', 'award', 'opportunity', 'program']
-                ))
+                headers = soup.find_all(['h2', 'h3', 'h4'], string=self._is_opportunity_header)
                 
                 for header in headers:
                     # Extract content around each header
@@ -65,26 +82,37 @@ class UndergradResearchScraper(BaseScraper):
         logger.info(f"Extracted {len(opportunities)} opportunities from undergraduate research page")
         return opportunities
     
+    @staticmethod
+    def _is_opportunity_header(text: str) -> bool:
+        """Check whether a header string names a funding opportunity."""
+        if not text:
+            return False
+        text_lower = text.lower()
+        return any(keyword in text_lower for keyword in _OPPORTUNITY_HEADER_KEYWORDS)
+    
     def _extract_opportunity_from_element(self, element: Tag) -> Dict[str, Any]:
         """Extract opportunity data from a single HTML element."""
         try:
+            # Walk the element's text once and share it between the helpers
+            text = element.get_text(separator=' ', strip=True)
+            
             # Extract title
-            title = self._extract_title(element)
+            title = self._extract_title(element, text)
             if not title:
                 return {}
             
             # Extract description
-            description = self._extract_description(element)
+            description = self._extract_description(element, text)
             
             # Extract other fields
-            deadline_text = self._extract_deadline_text(element)
+            deadline_text = self._extract_deadline_text(element, text)
             deadline = self.extract_deadline(deadline_text) if deadline_text else None
             
-            funding_amount = self._extract_funding_amount_text(element)
+            funding_amount = self._extract_funding_amount_text(element, text)
             funding_amount = self.extract_funding_amount(funding_amount) if funding_amount else None
             
-            eligibility = self._extract_eligibility(element)
-            contact_email = self._extract_contact_email(element)
+            eligibility = self._extract_eligibility(element, text)
+            contact_email = self._extract_contact_email(element, text)
             application_url = self._extract_application_url(element)
             department = self._extract_department(element)
             
@@ -110,153 +138,116 @@ class UndergradResearchScraper(BaseScraper):
             logger.error(f"Error extracting opportunity from element: {e}")
             return {}
     
-    def _extract_title(self, element: Tag) -> str:
+    def _extract_title(self, element: Tag, text: Optional[str] = None) -> str:
         """Extract title from element."""
         # Try different title selectors
-        title_selectors = ['h1', 'h2', 'h3', 'h4', '.title', '.heading', '.name']
-        
-        for selector in title_selectors:
-            title_elem = element.select_one(selector)
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-                if title and len(title) > 3:  # Minimum title length
-                    return title
+        for title_elem in _TITLE_SELECTOR.select(element):
+            title = title_elem.get_text(strip=True)
+            if title and len(title) > 3:  # Minimum title length
+                return title
         
         # Fallback: use element text if it's short enough to be a title
-        element_text = element.get_text(strip=True)
+        element_text = text if text is not None else element.get_text(strip=True)
         if element_text and len(element_text) < 200:
             return element_text.split('\n')[0]  # Take first line
         
         return ""
     
-    def _extract_description(self, element: Tag) -> str:
+    def _extract_description(self, element: Tag, text: Optional[str] = None) -> str:
         """Extract description from element."""
         # Try different description selectors
-        desc_selectors = [
-            '.description', '.content', '.details', '.summary',
-            'p', '.text', '.info'
-        ]
-        
         descriptions = []
-        for selector in desc_selectors:
-            desc_elements = element.select(selector)
-            for desc_elem in desc_elements:
-                desc_text = desc_elem.get_text(strip=True)
-                if desc_text and len(desc_text) > 20:  # Minimum description length
-                    descriptions.append(desc_text)
+        for desc_elem in _DESCRIPTION_SELECTOR.select(element):
+            desc_text = desc_elem.get_text(strip=True)
+            if desc_text and len(desc_text) > 20:  # Minimum description length
+                descriptions.append(desc_text)
         
         if descriptions:
             return ' '.join(descriptions[:3])  # Limit to first 3 paragraphs
         
         # Fallback: use all text content
-        all_text = element.get_text(strip=True)
+        all_text = text if text is not None else element.get_text(strip=True)
         if len(all_text) > 200:
             return all_text[:1000]  # Limit length
         
         return ""
     
-    def _extract_deadline_text(self, element: Tag) -> str:
+    def _extract_deadline_text(self, element: Tag, text: Optional[str] = None) -> str:
         """Extract deadline-related text from element."""
-        deadline_selectors = [
-            '.deadline', '.due-date', '.apply-by', '[class*="deadline"]',
-            '[class*="due"]', '.date'
-        ]
-        
-        for selector in deadline_selectors:
-            deadline_elem = element.select_one(selector)
-            if deadline_elem:
-                return deadline_elem.get_text(strip=True)
+        deadline_elem = _DEADLINE_SELECTOR.select_one(element)
+        if deadline_elem:
+            return deadline_elem.get_text(strip=True)
         
         # Look for deadline in text content
-        text = element.get_text()
+        if text is None:
+            text = element.get_text()
         deadline_keywords = ['deadline', 'due date', 'apply by', 'submission deadline']
         
-        for keyword in deadline_keywords:
-            if keyword in text.lower():
-                # Extract sentence containing the keyword
-                sentences = text.split('.')
-                for sentence in sentences:
-                    if keyword in sentence.lower():
-                        return sentence.strip()
-        
-        return ""
+        return self._find_sentence_with_keyword(text, deadline_keywords)
     
-    def _extract_funding_amount_text(self, element: Tag) -> str:
+    def _extract_funding_amount_text(self, element: Tag, text: Optional[str] = None) -> str:
         """Extract funding amount text from element."""
-        amount_selectors = [
-            '.amount', '.funding', '.award', '.stipend',
-            '[class*="amount"]', '[class*="funding"]'
-        ]
-        
-        for selector in amount_selectors:
-            amount_elem = element.select_one(selector)
-            if amount_elem:
-                return amount_elem.get_text(strip=True)
+        amount_elem = _AMOUNT_SELECTOR.select_one(element)
+        if amount_elem:
+            return amount_elem.get_text(strip=True)
         
         # Look for dollar amounts in text
-        text = element.get_text()
-        if '$' in text:
-            sentences = text.split('.')
-            for sentence in sentences:
-                if '$' in sentence:
-                    return sentence.strip()
+        if text is None:
+            text = element.get_text()
+        idx = text.find('$')
+        if idx != -1:
+            start = text.rfind('.', 0, idx) + 1
+            end = text.find('.', idx)
+            return text[start:end if end != -1 else len(text)].strip()
         
         return ""
     
-    def _extract_eligibility(self, element: Tag) -> str:
+    def _extract_eligibility(self, element: Tag, text: Optional[str] = None) -> str:
         """Extract eligibility requirements from element."""
-        eligibility_selectors = [
-            '.eligibility', '.requirements', '.criteria',
-            '[class*="eligibility"]', '[class*="requirement"]'
-        ]
-        
-        for selector in eligibility_selectors:
-            eligibility_elem = element.select_one(selector)
-            if eligibility_elem:
-                return eligibility_elem.get_text(strip=True)
+        eligibility_elem = _ELIGIBILITY_SELECTOR.select_one(element)
+        if eligibility_elem:
+            return eligibility_elem.get_text(strip=True)
         
         # Look for eligibility keywords in text
-        text = element.get_text()
+        if text is None:
+            text = element.get_text()
         eligibility_keywords = ['eligible', 'requirements', 'criteria', 'must be']
         
-        for keyword in eligibility_keywords:
-            if keyword in text.lower():
-                sentences = text.split('.')
-                for sentence in sentences:
-                    if keyword in sentence.lower():
-                        return sentence.strip()
+        return self._find_sentence_with_keyword(text, eligibility_keywords)
+    
+    @staticmethod
+    def _find_sentence_with_keyword(text: str, keywords: List[str]) -> str:
+        """Return the sentence around the first occurrence of the first keyword found in text."""
+        text_lower = text.lower()
+        
+        for keyword in keywords:
+            idx = text_lower.find(keyword)
+            if idx != -1:
+                # Slice out the enclosing sentence rather than splitting the whole text
+                start = text.rfind('.', 0, idx) + 1
+                end = text.find('.', idx)
+                return text[start:end if end != -1 else len(text)].strip()
         
         return ""
     
-    def _extract_contact_email(self, element: Tag) -> str:
+    def _extract_contact_email(self, element: Tag, text: Optional[str] = None) -> str:
         """Extract contact email from element."""
         # Look for email links
-        email_links = element.select('a[href^="mailto:"]')
+        email_links = _MAILTO_SELECTOR.select(element)
         if email_links:
             return email_links[0]['href'].replace('mailto:', '')
         
         # Look for email addresses in text
-        import re
-        text = element.get_text()
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        
-        if emails:
-            return emails[0]
-        
-        return ""
+        if text is None:
+            text = element.get_text()
+        match = _EMAIL_RE.search(text)
+        return match.group(0) if match else ""
     
     def _extract_application_url(self, element: Tag) -> str:
         """Extract application URL from element."""
         # Look for application links
-        app_selectors = [
-            'a[href*="apply"]', 'a[href*="application"]',
-            '.apply-link', '.application-link', '[class*="apply"]'
-        ]
-        
-        for selector in app_selectors:
-            link = element.select_one(selector)
-            if link and link.get('href'):
+        for link in _APPLICATION_SELECTOR.select(element):
+            if link.get('href'):
                 url = link['href']
                 if url.startswith('http'):
                     return url
@@ -267,15 +258,9 @@ class UndergradResearchScraper(BaseScraper):
     
     def _extract_department(self, element: Tag) -> str:
         """Extract department information from element."""
-        dept_selectors = [
-            '.department', '.dept', '.school', '.division',
-            '[class*="department"]', '[class*="dept"]'
-        ]
-        
-        for selector in dept_selectors:
-            dept_elem = element.select_one(selector)
-            if dept_elem:
-                return dept_elem.get_text(strip=True)
+        dept_elem = _DEPARTMENT_SELECTOR.select_one(element)
+        if dept_elem:
+            return dept_elem.get_text(strip=True)
         
         # Default to undergraduate research if not specified
         return "Undergraduate Research"
@@ -288,9 +273,9 @@ class UndergradResearchScraper(BaseScraper):
             # Look for any text that might be opportunities
             all_text = soup.get_text()
             
-            # Split by common delimiters and look for opportunity-like content
+            # Split on the first common delimiter present and look for opportunity-like content
             sections = []
-            for delimiter in ['\n\n', '***', '---', '===']:
+            for delimiter in _SECTION_DELIMITERS:
                 if delimiter in all_text:
                     sections = all_text.split(delimiter)
                     break
@@ -301,8 +286,7 @@ class UndergradResearchScraper(BaseScraper):
                 sections = [p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50]
             
             for section in sections:
-                if len(section) > 100 and any(keyword in section.lower() for keyword in 
-                    ['fund', 'grant', 'award', 'opportunity', 'program', 'fellowship']):
+                if len(section) > 100 and _OPPORTUNITY_KEYWORDS_RE.search(section):
                     
                     # Try to extract a title (first line or sentence)
                     lines = section.strip().split('\n')
@@ -6,24 +6,155 @@ and extract structured information in JSON format.
 """
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+import hashlib
 import json
-from typing import Dict, Any, Optional, List
+import os
+import tempfile
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, date
+from functools import lru_cache
 import random
+import time
+import orjson
 from pydantic import BaseModel
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 import re
 
 try:
-    from google import genai
-    from google.genai import types
-    GEMINI_AVAILABLE = True
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
 except ImportError:
-    GEMINI_AVAILABLE = False
+    REDIS_AVAILABLE = False
 
 from loguru import logger
 from ..config import settings
 
+# Non-content elements dropped before extracting page text for the prompt
+_SLIM_XPATH = '//script|//style|//nav|//header|//footer|//aside|//svg|//noscript'
+
+
+def _class_token(name: str) -> str:
+    """XPath predicate matching a whole class token."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# The aggressive profile also drops media, form controls, hidden elements and
+# ad/tracking/cookie widgets. <form> itself is kept since some sites wrap the
+# whole page in one.
+_AGGRESSIVE_XPATH = _SLIM_XPATH + (
+    '|//canvas|//video|//audio|//iframe|//template|//button|//select|//textarea'
+    '|//*[@role="navigation" or @role="banner" or @aria-hidden="true" or @hidden]'
+    '|//*[' + ' or '.join(_class_token(name) for name in (
+        'ad', 'ads', 'advert', 'advertisement', 'tracking', 'cookie-banner',
+        'cookie-consent', 'breadcrumb', 'breadcrumbs', 'skip-link', 'visually-hidden', 'sr-only'
+    )) + ']'
+)
+_NON_CONTENT_XPATHS = {
+    'slim': etree.XPath(_SLIM_XPATH),
+    'aggressive': etree.XPath(_AGGRESSIVE_XPATH),
+}
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Title quality patterns, fused into one alternation so each title is scanned once
+_GENERIC_TITLE_PATTERNS = (
+    'application form', 'application deadline', 'apply here', 'research opportunities',
+    'undergraduate program', 'graduate program', 'research staff', 'research topics',
+    'eligibility', 'deadline', 'apply now'
+)
+_NAV_TITLE_PATTERNS = ('toggle', 'menu', 'navigation', 'programtoggle', 'overview')
+_DEPT_ONLY_TITLE_PATTERNS = ('department', 'school of', 'institute', 'center for')
+_TITLE_ISSUE_RE = re.compile('|'.join(
+    f"(?P<{group}>{'|'.join(map(re.escape, sorted(patterns, key=len, reverse=True)))})"
+    for group, patterns in (
+        ('generic', _GENERIC_TITLE_PATTERNS),
+        ('nav', _NAV_TITLE_PATTERNS),
+        ('dept', _DEPT_ONLY_TITLE_PATTERNS),
+    )
+))
+
+# Static prompt text, built once. The field list doubles as a compact schema.
+_PROMPT_PREFIX = """Extract research opportunities from this university web page.
+
+Rules:
+- title: the real name of the program, lab or organization in 3-8 words, never a concatenated run of page text
+- description: a 1-3 sentence summary of what it offers, not raw page text
+- Include only genuine research programs, opportunities or labs; ignore navigation, headers and footers
+- If the page has no clear opportunities, return []"""
+
+_OPPORTUNITY_FIELDS = """{"title": str, "description": str, "tags": [str], "deadline": str|null, "funding_amount": str|null (e.g. "$6000 stipend"), "application_url": str|null (only if different from the source URL), "contact_email": str|null, "eligibility_requirements": str|null (who can apply), "department": str|null, "opportunity_type": "research"|"internship"|"funding"|"fellowship"|"leadership"}"""
+_PROMPT_SUFFIX = "Respond with ONLY a JSON array of objects with these keys:\n" + _OPPORTUNITY_FIELDS
+
+# Several small pages packed into one prompt, answered as {source_url: [opportunities]}
+_PACKED_PROMPT_PREFIX = _PROMPT_PREFIX.replace(
+    "from this university web page", "from each of these university web pages"
+)
+_PACKED_PROMPT_SUFFIX = (
+    "Respond with ONLY a JSON object mapping every source URL above to a JSON array "
+    "(empty if none) of the opportunities on that page, each with these keys:\n" + _OPPORTUNITY_FIELDS
+)
+
+# Decoder for pulling complete objects out of a streamed reply
+_JSON_DECODER = json.JSONDecoder()
+
+# Repairs for gemma's free-text JSON: over-escaped quotes and literal \n sequences
+_ESCAPE_REPAIR_RE = re.compile(r'\\"|\\n')
+_ESCAPE_REPAIRS = {'\\"': '"', '\\n': ' '}
+
+
+def _repair_escape(match: re.Match) -> str:
+    return _ESCAPE_REPAIRS[match.group()]
+
+
+# Server-suggested wait in a 429 body, e.g. "retryDelay": "37s"
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s")
+_DEFAULT_RATE_LIMIT_COOLDOWN = 30.0
+_MAX_BACKOFF_SECONDS = 30.0
+
+# Title quality issue bits returned by _score_title
+_TITLE_GENERIC = 1  # Generic/meaningless title
+_TITLE_NAV = 2  # Navigation/menu artifact
+_TITLE_LONG = 4  # Overly long (likely concatenated text)
+_TITLE_SHORT = 8  # Empty or very short
+_TITLE_DEPT_ONLY = 16  # Just a department name
+_TITLE_ISSUE_LABELS = (
+    (_TITLE_GENERIC, "Generic title"),
+    (_TITLE_NAV, "Navigation artifact"),
+    (_TITLE_LONG, "Overly long title"),
+    (_TITLE_SHORT, "Too short title"),
+    (_TITLE_DEPT_ONLY, "Department-only title"),
+)
+_TITLE_GROUP_FLAGS = {'generic': _TITLE_GENERIC, 'nav': _TITLE_NAV}
+
+
+@lru_cache(maxsize=4096)
+def _score_title(title: str) -> int:
+    """Return a bitmask of quality issues for a title (0 means clean)."""
+    flags = 0
+    department_only = False
+    for match in _TITLE_ISSUE_RE.finditer(title.lower()):
+        if match.lastgroup == 'dept':
+            department_only = True
+        else:
+            flags |= _TITLE_GROUP_FLAGS[match.lastgroup]
+    
+    word_count = len(title.split())
+    if word_count > 12:
+        flags |= _TITLE_LONG
+    if len(title.strip()) < 3:
+        flags |= _TITLE_SHORT
+    if department_only and word_count <= 3:
+        flags |= _TITLE_DEPT_ONLY
+    return flags
+
+
+# Batch job states after which polling stops
+_BATCH_TERMINAL_STATES = frozenset({
+    'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'
+})
+
 
 class OpportunityData(BaseModel):
     """Structured data model for parsed research opportunities."""
@@ -39,12 +170,173 @@ class OpportunityData(BaseModel):
     opportunity_type: Optional[str] = None
 
 
+# list[OpportunityData] as a REST schema, for Batch API request lines (plain JSON, not SDK types)
+_OPPORTUNITY_LIST_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "title": {"type": "STRING"},
+            "description": {"type": "STRING"},
+            "tags": {"type": "ARRAY", "items": {"type": "STRING"}},
+            **{
+                name: {"type": "STRING", "nullable": True}
+                for name in ("deadline", "funding_amount", "application_url", "contact_email",
+                             "eligibility_requirements", "department", "opportunity_type")
+            },
+        },
+        "required": ["title", "description"],
+    },
+}
+
+# Digest of the prompts and response schemas; part of every cache key so a prompt
+# or schema change stops serving parses made under the old one
+_PROMPT_VERSION = hashlib.blake2b(orjson.dumps([
+    _PROMPT_PREFIX, _PROMPT_SUFFIX, _PACKED_PROMPT_PREFIX, _PACKED_PROMPT_SUFFIX,
+    OpportunityData.model_json_schema(), _OPPORTUNITY_LIST_SCHEMA,
+], option=orjson.OPT_SORT_KEYS), digest_size=4).hexdigest()
+
+
+def _clean_html_text(html_content: str, profile: str) -> str:
+    """
+    Clean and extract text content from HTML.
+    
+    Module-level so it can run in an executor; ``profile`` selects how much
+    is stripped ("slim" or "aggressive").
+    """
+    if not html_content:
+        return ""
+    
+    non_content_xpath = _NON_CONTENT_XPATHS.get(profile, _NON_CONTENT_XPATHS['slim'])
+    
+    try:
+        # Parse with lxml directly; encoding as bytes lets pages keep an XML declaration.
+        # Comments are dropped by the parser, and attributes such as data: URIs
+        # never reach the extracted text.
+        root = lxml.html.document_fromstring(
+            html_content.encode('utf-8', 'replace'),
+            parser=lxml.html.HTMLParser(encoding='utf-8', remove_comments=True)
+        )
+        
+        # Remove non-content elements (tail text is kept)
+        for element in non_content_xpath(root):
+            element.drop_tree()
+        
+        # Get text content and normalize whitespace
+        text = _WHITESPACE_RE.sub(' ', ' '.join(root.itertext())).strip()
+        
+        # Limit text length to avoid token limits (roughly 6000 characters ≈ 1500 tokens)
+        if len(text) > 6000:
+            text = text[:6000] + "..."
+        
+        return text
+        
+    except etree.ParserError:
+        # Nothing but whitespace or comments
+        return ""
+    except Exception as e:
+        logger.warning(f"Error cleaning HTML content: {e}")
+        return html_content[:6000] if html_content else ""
+
+
+class _StreamingArrayParser:
+    """Collect complete objects from a JSON array while its text streams in."""
+    
+    def __init__(self):
+        self.items: List[Dict[str, Any]] = []
+        self._buffer = ''
+        self._pos: Optional[int] = None  # Next index to scan, once '[' is seen
+    
+    @property
+    def text(self) -> str:
+        """Full response text received so far."""
+        return self._buffer
+    
+    def feed(self, chunk: str) -> None:
+        """Add streamed text and decode any objects it completes."""
+        self._buffer += chunk
+        if self._pos is None:
+            start = self._buffer.find('[')
+            if start == -1:
+                return
+            self._pos = start + 1
+        while True:
+            start = self._buffer.find('{', self._pos)
+            if start == -1:
+                return
+            try:
+                item, end = _JSON_DECODER.raw_decode(self._buffer, start)
+            except json.JSONDecodeError:
+                # Object not complete yet (or malformed); wait for more text
+                return
+            self.items.append(item)
+            self._pos = end
+
+
+@lru_cache(maxsize=None)
+def _load_genai():
+    """Import the Google GenAI SDK on first use; returns (genai, types) or None if not installed."""
+    try:
+        from google import genai
+        from google.genai import types
+    except ImportError:
+        return None
+    return genai, types
+
+
+def _supports_json_mode(model: str) -> bool:
+    """Whether the model supports structured output (Gemma models don't)."""
+    return model.startswith('gemini-')
+
+
+class _TokenBucket:
+    """Token bucket refilled continuously at ``capacity`` units per ``period`` seconds."""
+    
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = capacity
+        self._updated = time.monotonic()
+    
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until ``amount`` units are available, then take them."""
+        amount = min(amount, self.capacity)
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return
+            await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
 class LLMHtmlParsingService:
     """Service for parsing HTML content using Google Gemini API."""
     
     def __init__(self):
-        if not GEMINI_AVAILABLE:
-            logger.warning("Google GenAI library not available. HTML parsing will be disabled.")
+        # Track daily API usage to enforce budget limits (mirrored in Redis when available)
+        self._calls_today_date: Optional[date] = None
+        self._calls_today_count: int = 0
+        
+        # Client-side RPM/TPM limits, plus a shared pause after a 429
+        self._request_limiter = _TokenBucket(settings.llm_requests_per_minute)
+        self._token_limiter = _TokenBucket(settings.llm_tokens_per_minute)
+        self._cooldown_until: float = 0.0
+        
+        # Threads for HTML cleanup: lxml releases the GIL while parsing, and
+        # Celery's daemonic prefork workers can't start a process pool.
+        # Created on first use and released by aclose() after each run
+        self._html_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Redis client for the parse cache and shared budget, created lazily per event loop
+        self._cache = None
+        self._cache_loop = None
+        self._cache_disabled = not (settings.enable_llm_cache and REDIS_AVAILABLE)
+        
+        # The SDK is only imported once parsing is enabled and configured
+        if not settings.enable_llm_parsing:
+            logger.info("LLM parsing is disabled; Gemini client not initialized.")
             self.client = None
             return
             
@@ -53,16 +345,52 @@ class LLMHtmlParsingService:
             self.client = None
             return
         
+        genai_modules = _load_genai()
+        if genai_modules is None:
+            logger.warning("Google GenAI library not available. HTML parsing will be disabled.")
+            self.client = None
+            return
+        genai, self._types = genai_modules
+        self._genai = genai  # Kept so aclose() can replace the client for the next run
+        
         try:
+            # One client for the service's lifetime: the SDK keeps a pooled
+            # keep-alive HTTP client per genai.Client, so calls reuse connections
             self.client = genai.Client(api_key=settings.gemini_api_key)
             logger.info(f"Initialized Gemini client with model: {settings.gemini_model}")
         except Exception as e:
             logger.error(f"Failed to initialize Gemini client: {e}")
             self.client = None
         
-        # Track daily API usage to enforce budget limits
-        self._calls_today_date: Optional[date] = None
-        self._calls_today_count: int = 0
+
+    async def aclose(self) -> None:
+        """Close the Gemini client's connections, the cache client and the cleanup pool.
+
+        Called at the end of each scrape run. The service stays usable afterwards:
+        the pool and cache client are recreated on demand and the Gemini client is
+        replaced, since its async transport is bound to the loop that just finished.
+        """
+        aio_client = getattr(self.client, 'aio', None)
+        if aio_client is not None and hasattr(aio_client, 'aclose'):
+            try:
+                await aio_client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing Gemini client: {e}")
+            try:
+                self.client = self._genai.Client(api_key=settings.gemini_api_key)
+            except Exception as e:
+                logger.error(f"Failed to reinitialize Gemini client: {e}")
+                self.client = None
+        if self._cache is not None:
+            try:
+                await self._cache.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing LLM parse cache: {e}")
+            self._cache = None
+            self._cache_loop = None
+        if self._html_pool is not None:
+            self._html_pool.shutdown(wait=False)
+            self._html_pool = None
 
     @property
     def daily_call_count(self) -> int:
@@ -77,50 +405,160 @@ class LLMHtmlParsingService:
         """Get daily call limit from settings."""
         return settings.llm_daily_call_limit
 
-    def _check_daily_budget(self) -> bool:
-        """Check if we're within daily API call limits."""
+    async def _reserve_daily_calls(self, count: int = 1) -> bool:
+        """
+        Reserve ``count`` calls against the daily budget, or return False if that would exceed it.
+        
+        The check and increment happen together: in Redis through INCRBY (shared by
+        every worker), otherwise locally with no await in between, so concurrent
+        tasks can't all pass the check before any of them is counted.
+        """
         today = date.today()
+        limit = settings.llm_daily_call_limit
         
         # Reset counter for new day
         if self._calls_today_date != today:
             self._calls_today_date = today
             self._calls_today_count = 0
         
-        # Check if we've exceeded daily limit
-        if self._calls_today_count >= settings.llm_daily_call_limit:
-            logger.warning(f"Daily Gemini API call limit reached ({settings.llm_daily_call_limit})")
-            return False
+        cache = self._get_cache()
+        if cache is not None:
+            key = f"llm:calls:{today.isoformat()}"
+            try:
+                total = await cache.incrby(key, count)
+                if total == count:
+                    await cache.expire(key, 48 * 3600)
+                if total > limit:
+                    await cache.decrby(key, count)
+                    logger.warning(f"Daily Gemini API call limit reached ({limit})")
+                    return False
+                self._calls_today_count += count
+                return True
+            except Exception as e:
+                self._disable_cache(e)
         
+        if self._calls_today_count + count > limit:
+            logger.warning(f"Daily Gemini API call limit reached ({limit})")
+            return False
+        self._calls_today_count += count
         return True
 
-    def _clean_html_content(self, html_content: str) -> str:
-        """Clean and extract text content from HTML."""
-        if not html_content:
-            return ""
-        
+    async def _release_daily_calls(self, count: int) -> None:
+        """Give back reserved calls that were never made."""
+        self._calls_today_count = max(0, self._calls_today_count - count)
+        cache = self._get_cache()
+        if cache is not None:
+            try:
+                await cache.decrby(f"llm:calls:{date.today().isoformat()}", count)
+            except Exception as e:
+                self._disable_cache(e)
+
+    async def _wait_for_rate_limit(self, estimated_tokens: int) -> None:
+        """Block until a call fits within the cooldown and RPM/TPM budgets."""
+        delay = self._cooldown_until - time.monotonic()
+        if delay > 0:
+            logger.info(f"Gemini rate limited, waiting {delay:.1f}s")
+            await asyncio.sleep(delay)
+        await self._request_limiter.acquire()
+        await self._token_limiter.acquire(estimated_tokens)
+
+    def _backoff_delay(self, attempt: int, base: float) -> float:
+        """Full-jitter exponential backoff that never ends inside a 429 cooldown."""
+        delay = random.uniform(0, min(_MAX_BACKOFF_SECONDS, base * 2 ** attempt))
+        return max(delay, self._cooldown_until - time.monotonic())
+
+    def _start_cooldown(self, error: Exception) -> None:
+        """Pause all callers after a 429, for as long as the server asks."""
+        delay = _DEFAULT_RATE_LIMIT_COOLDOWN
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        retry_after = headers.get('retry-after')
+        match = _RETRY_DELAY_RE.search(str(error))
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        elif match:
+            delay = float(match.group(1))
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+        logger.warning(f"Gemini returned 429, pausing calls for {delay:.0f}s")
+
+    def _cache_key(self, cleaned_html: str, source_url: str) -> str:
+        """Build the cache key for a page; keyed on the model and prompt version so changes invalidate."""
+        digest = hashlib.blake2b(
+            f"{source_url}\0{cleaned_html}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+        return f"llm:{settings.gemini_model}:{_PROMPT_VERSION}:{digest}"
+
+    def _page_cache_key(self, source_url: str) -> str:
+        """Build the cache key holding the last parsed text and result for a URL."""
+        digest = hashlib.blake2b(source_url.encode('utf-8'), digest_size=16).hexdigest()
+        return f"llm:{settings.gemini_model}:{_PROMPT_VERSION}:page:{digest}"
+
+    @staticmethod
+    def _is_near_duplicate(previous_text: str, cleaned_html: str) -> bool:
+        """Check whether two cleaned page texts differ only trivially."""
+        threshold = settings.llm_similar_cache_threshold
+        # Compare word sequences; autojunk would discard the most common words
+        matcher = SequenceMatcher(None, previous_text.split(), cleaned_html.split(), autojunk=False)
+        # Cheap upper bounds first; the full ratio is quadratic in the worst case
+        return (
+            matcher.real_quick_ratio() >= threshold
+            and matcher.quick_ratio() >= threshold
+            and matcher.ratio() >= threshold
+        )
+
+    async def _similar_cache_get(self, source_url: str, cleaned_html: str) -> Optional[Dict[str, Any]]:
+        """Return the URL's previous parse if its content has barely changed."""
+        if settings.llm_similar_cache_threshold > 1:
+            return None
+        entry = await self._cache_get(self._page_cache_key(source_url))
+        if not entry or not entry.get("text"):
+            return None
+        if await asyncio.to_thread(self._is_near_duplicate, entry["text"], cleaned_html):
+            return entry.get("result")
+        return None
+
+    def _get_cache(self):
+        """Get the Redis client for the current event loop, or None if caching is off."""
+        if self._cache_disabled:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._cache is None or self._cache_loop is not loop:
+            self._cache = aioredis.from_url(
+                settings.redis_url, socket_connect_timeout=2, socket_timeout=2
+            )
+            self._cache_loop = loop
+        return self._cache
+
+    def _disable_cache(self, error: Exception) -> None:
+        """Stop using the cache for this process after a Redis failure."""
+        logger.warning(f"LLM parse cache unavailable, continuing without it: {error}")
+        self._cache = None
+        self._cache_disabled = True
+
+    async def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached entry, if any."""
+        cache = self._get_cache()
+        if cache is None:
+            return None
         try:
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script, style, and other non-content elements
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up whitespace and normalize
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            # Limit text length to avoid token limits (roughly 6000 characters ≈ 1500 tokens)
-            if len(text) > 6000:
-                text = text[:6000] + "..."
-            
-            return text
-            
+            cached = await cache.get(key)
         except Exception as e:
-            logger.warning(f"Error cleaning HTML content: {e}")
-            return html_content[:6000] if html_content else ""
+            self._disable_cache(e)
+            return None
+        return orjson.loads(cached) if cached else None
+
+    async def _cache_set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a cache entry."""
+        cache = self._get_cache()
+        if cache is None:
+            return
+        try:
+            await cache.setex(key, settings.llm_cache_ttl, orjson.dumps(value))
+        except Exception as e:
+            self._disable_cache(e)
+
+    def _clean_html_content(self, html_content: str, profile: Optional[str] = None) -> str:
+        """Clean and extract text content from HTML (profile defaults to ``settings.llm_clean_profile``)."""
+        return _clean_html_text(html_content, profile or settings.llm_clean_profile)
 
     def _validate_title_quality(self, opportunities: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -135,47 +573,20 @@ class LLMHtmlParsingService:
         if not opportunities:
             return {"valid": True, "issues": []}
         
-        issues = []
-        for i, opp in enumerate(opportunities):
-            title = opp.get('title', '')
-            
-            # Check for common quality issues
-            quality_issues = []
-            
-            # Check for generic/meaningless titles
-            generic_patterns = [
-                'application form', 'application deadline', 'apply here', 'research opportunities',
-                'undergraduate program', 'graduate program', 'research staff', 'research topics',
-                'eligibility', 'deadline', 'apply now'
-            ]
-            
-            if any(pattern in title.lower() for pattern in generic_patterns):
-                quality_issues.append(f"Generic title: '{title}'")
-            
-            # Check for navigation/menu artifacts
-            nav_patterns = ['toggle', 'menu', 'navigation', 'programtoggle', 'overview']
-            if any(pattern in title.lower() for pattern in nav_patterns):
-                quality_issues.append(f"Navigation artifact: '{title}'")
-            
-            # Check for overly long titles (likely concatenated text)
-            if len(title.split()) > 12:
-                quality_issues.append(f"Overly long title: '{title}'")
-            
-            # Check for empty or very short titles
-            if len(title.strip()) < 3:
-                quality_issues.append(f"Too short title: '{title}'")
-            
-            # Check for titles that are just department names
-            dept_only_patterns = ['department', 'school of', 'institute', 'center for']
-            if any(pattern in title.lower() for pattern in dept_only_patterns) and len(title.split()) <= 3:
-                quality_issues.append(f"Department-only title: '{title}'")
-            
-            if quality_issues:
-                issues.append({
-                    "opportunity_index": i,
-                    "title": title,
-                    "issues": quality_issues
-                })
+        # Pull titles into a column once, then score them in one map pass
+        # (cached per distinct title); only flagged titles build messages
+        titles = [opp.get('title', '') for opp in opportunities]
+        title_flags = list(map(_score_title, titles))
+        issues = [
+            {
+                "opportunity_index": i,
+                "title": titles[i],
+                "issues": [
+                    f"{label}: '{titles[i]}'" for flag, label in _TITLE_ISSUE_LABELS if flags & flag
+                ]
+            }
+            for i, flags in enumerate(title_flags) if flags
+        ]
         
         # Consider results invalid if more than 30% have quality issues
         threshold = len(opportunities) * 0.3
@@ -189,148 +600,123 @@ class LLMHtmlParsingService:
             "quality_score": (len(opportunities) - len(issues)) / len(opportunities) if opportunities else 1.0
         }
 
-    async def _call_gemini_api(self, cleaned_html: str, source_url: str) -> Dict[str, Any]:
+    def _build_prompt(self, cleaned_html: str, source_url: str) -> str:
+        """Create the parsing prompt for one page."""
+        return f"{_PROMPT_PREFIX}\n\nSource URL: {source_url}\n\nPage content:\n{cleaned_html}\n\n{_PROMPT_SUFFIX}"
+
+    def _build_parse_result(self, parsed_opportunities: List[Dict[str, Any]], source_url: str) -> Dict[str, Any]:
+        """Wrap parsed opportunities with their title quality validation."""
+        quality_validation = self._validate_title_quality(parsed_opportunities)
+        
+        logger.info(f"Successfully parsed {len(parsed_opportunities)} opportunities from {source_url}")
+        return {
+            "success": True,
+            "opportunities": parsed_opportunities,
+            "source_url": source_url,
+            "quality_validation": quality_validation
+        }
+
+    def _parse_response_text(self, response_text: str, source_url: str) -> Dict[str, Any]:
+        """Clean a raw model response and parse it into opportunities."""
+        try:
+            response_text = response_text.strip()
+            
+            # Remove any markdown formatting if present
+            if response_text.startswith("```json"):
+                response_text = response_text[7:]
+            if response_text.startswith("```"):
+                response_text = response_text[3:]
+            if response_text.endswith("```"):
+                response_text = response_text[:-3]
+            
+            # Clean up any extra text before/after JSON
+            response_text = response_text.strip()
+            
+            # Find JSON array boundaries
+            start_idx = response_text.find('[')
+            end_idx = response_text.rfind(']')
+            
+            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
+                json_text = response_text[start_idx:end_idx + 1]
+            else:
+                json_text = response_text
+            
+            # Additional cleaning for gemma-3-27b-it issues (truncated replies are
+            # caught earlier from finish_reason)
+            # Fix over-escaped quotes and literal newlines in one pass
+            json_text = _ESCAPE_REPAIR_RE.sub(_repair_escape, json_text)
+            
+            parsed_opportunities = orjson.loads(json_text)
+            if not isinstance(parsed_opportunities, list):
+                parsed_opportunities = []
+            
+            return self._build_parse_result(parsed_opportunities, source_url)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response from Gemini: {e}")
+            logger.debug(f"Raw response: {response_text[:500]}...")
+            return {"error": f"json_decode_error: {e}"}
+
+    async def _call_gemini_api(
+        self, cleaned_html: str, source_url: str, max_output_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
         """Make API call to Gemini for HTML parsing."""
         if not self.client:
             return {"error": "Gemini client not available"}
         
-        if not self._check_daily_budget():
+        if not await self._reserve_daily_calls():
             return {"error": "daily_budget_exceeded"}
         
         try:
-            # Create the parsing prompt with strong JSON enforcement
-            prompt = f"""
-You are an expert at parsing research opportunity web pages. Your job is to extract clean, high-quality information about research programs and opportunities.
-
-CRITICAL REQUIREMENTS:
-1. TITLE must be the actual name of the research program, lab, or organization - NOT a concatenated mess of text
-2. DESCRIPTION must be a clear, concise summary (1-3 sentences) of what the program offers - NOT raw HTML text
-3. Only extract genuine research opportunities, programs, or labs - ignore navigation menus, headers, footers
-
-IMPORTANT: You MUST respond with ONLY a valid JSON array. Start with [ and end with ].
-
-Source URL: {source_url}
-
-HTML Content:
-{cleaned_html}
-
-For each legitimate research opportunity or program, extract:
-
-- title: The clean, proper name of the research program, lab, or organization (e.g. "Stanford Bio-X USRP", "Machine Learning Lab", "Aeronautics Research Program")
-- description: A clear 1-3 sentence summary of what the program offers (e.g. "10-week summer research program for undergraduates in interdisciplinary biological sciences with full stipend support.")
-- tags: Relevant keywords (e.g. ["Summer Research", "Biology", "Undergraduate"])
-- deadline: Application deadline if clearly mentioned
-- funding_amount: Specific funding/stipend amounts if mentioned (e.g. "$6000 stipend", "Paid position")
-- application_url: Direct application link if different from source URL
-- contact_email: Contact email if provided
-- eligibility_requirements: Who can apply (e.g. "Undergraduate students", "PhD candidates")
-- department: The academic department (e.g. "Computer Science", "Biology")
-- opportunity_type: MUST be one of: "research", "internship", "funding", "fellowship", "leadership"
-
-QUALITY STANDARDS:
-- Titles should be 3-8 words, not full sentences
-- Descriptions should be informative summaries, not raw text dumps
-- Only include real opportunities, not general information pages
-- If no clear opportunities exist, return empty array: []
-
-Example GOOD output:
-[
-  {{
-    "title": "Stanford Bio-X USRP",
-    "description": "10-week summer research program for undergraduates in interdisciplinary biological sciences with full stipend support.",
-    "tags": ["Summer Research", "Biology", "Interdisciplinary", "Undergraduate"],
-    "deadline": "February 1, 2025",
-    "funding_amount": "$6000 stipend",
-    "application_url": null,
-    "contact_email": "biox-usrp@stanford.edu",
-    "eligibility_requirements": "Stanford undergraduate students",
-    "department": "Bio-X",
-    "opportunity_type": "research"
-  }}
-]
-
-Respond with ONLY the JSON array:
-"""
+            prompt = self._build_prompt(cleaned_html, source_url)
 
-            # Make the API call WITHOUT response_mime_type for gemma-3-27b-it
-            response = self.client.models.generate_content(
+            config_kwargs = {
+                "max_output_tokens": max_output_tokens or settings.llm_max_tokens,
+                "temperature": 0.1  # Low temperature for consistent extraction
+            }
+            if _supports_json_mode(settings.gemini_model):
+                # Gemini models can return schema-validated JSON directly
+                config_kwargs["response_mime_type"] = "application/json"
+                config_kwargs["response_schema"] = list[OpportunityData]
+            # Gemma models (e.g. gemma-3-27b-it) don't support JSON mode; their
+            # free-text reply goes through the repair path below.
+            
+            # Stream the reply through the async client so the event loop stays
+            # free and complete objects are picked up as they arrive.
+            stream = await self.client.aio.models.generate_content_stream(
                 model=settings.gemini_model,
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    max_output_tokens=settings.llm_max_tokens,
-                    temperature=0.1  # Low temperature for consistent extraction
-                    # Note: No response_mime_type since gemma-3-27b-it doesn't support JSON mode
-                )
+                config=self._types.GenerateContentConfig(**config_kwargs)
             )
             
-            # Increment API call counter
-            self._calls_today_count += 1
+            array_parser = _StreamingArrayParser()
+            finish_reason = None
+            async for chunk in stream:
+                if chunk.text:
+                    array_parser.feed(chunk.text)
+                if chunk.candidates and chunk.candidates[0].finish_reason:
+                    finish_reason = chunk.candidates[0].finish_reason
             
-            # Clean and parse the response
-            try:
-                response_text = response.text.strip()
-                
-                # Remove any markdown formatting if present
-                if response_text.startswith("```json"):
-                    response_text = response_text[7:]
-                if response_text.startswith("```"):
-                    response_text = response_text[3:]
-                if response_text.endswith("```"):
-                    response_text = response_text[:-3]
-                
-                # Clean up any extra text before/after JSON
-                response_text = response_text.strip()
-                
-                # Find JSON array boundaries
-                start_idx = response_text.find('[')
-                end_idx = response_text.rfind(']')
-                
-                if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                    json_text = response_text[start_idx:end_idx + 1]
+            if getattr(finish_reason, 'name', finish_reason) == 'MAX_TOKENS':
+                # Output budget ran out mid-array; keep only objects that arrived
+                # complete and let the caller retry with a bigger budget
+                logger.warning(f"Gemini reply hit max_output_tokens for {source_url} ({len(array_parser.items)} complete opportunities)")
+                if array_parser.items:
+                    result = self._build_parse_result(array_parser.items, source_url)
                 else:
-                    json_text = response_text
-                
-                # Additional cleaning for gemma-3-27b-it issues
-                # Fix common issues with truncated or malformed JSON
-                if json_text.endswith('"...') or json_text.endswith('"cont...'):
-                    # Handle truncated responses - remove incomplete last entry
-                    lines = json_text.split('\n')
-                    # Find the last complete object by looking for proper closing
-                    for i in range(len(lines) - 1, -1, -1):
-                        if lines[i].strip().endswith('}') or lines[i].strip().endswith('},'):
-                            # Reconstruct JSON up to this point
-                            json_text = '\n'.join(lines[:i+1])
-                            # Ensure proper array closing
-                            if not json_text.rstrip().endswith(']'):
-                                # Remove trailing comma if present
-                                json_text = json_text.rstrip().rstrip(',')
-                                json_text += '\n]'
-                            break
-                
-                # Fix common escape sequence issues
-                json_text = json_text.replace('\\"', '"')  # Fix over-escaped quotes
-                json_text = json_text.replace('\\n', ' ')  # Replace newlines with spaces
-                
-                parsed_opportunities = json.loads(json_text)
-                if not isinstance(parsed_opportunities, list):
-                    parsed_opportunities = []
-                
-                # Validate title quality
-                quality_validation = self._validate_title_quality(parsed_opportunities)
-                    
-                logger.info(f"Successfully parsed {len(parsed_opportunities)} opportunities from {source_url}")
-                return {
-                    "success": True,
-                    "opportunities": parsed_opportunities,
-                    "source_url": source_url,
-                    "quality_validation": quality_validation
-                }
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response from Gemini: {e}")
-                logger.debug(f"Raw response: {response.text[:500]}...")
-                return {"error": f"json_decode_error: {e}"}
+                    result = {"error": "truncated_response"}
+                result["truncated"] = True
+                return result
+            
+            result = self._parse_response_text(array_parser.text, source_url)
+            if not result.get("success") and array_parser.items:
+                # Keep the objects that did arrive complete
+                logger.warning(f"Using {len(array_parser.items)} streamed opportunities from an unparseable reply for {source_url}")
+                result = self._build_parse_result(array_parser.items, source_url)
+            return result
                 
         except Exception as e:
+            if getattr(e, 'code', None) == 429 or 'RESOURCE_EXHAUSTED' in str(e):
+                self._start_cooldown(e)
             logger.error(f"Gemini API call failed: {e}")
             return {"error": f"api_call_failed: {e}"}
 
@@ -358,23 +744,68 @@ Respond with ONLY the JSON array:
             logger.info(f"Skipping LLM parsing (sampling: {settings.llm_parse_percent})")
             return {"error": "skipped_sampling"}
         
-        # Clean the HTML content
-        cleaned_html = self._clean_html_content(html_content)
+        cleaned_html = await self._clean_in_pool(html_content)
+        return await self._parse_cleaned_html(cleaned_html, source_url)
+
+    async def _clean_in_pool(self, html_content: str) -> str:
+        """Clean HTML off the event loop so other pages' Gemini calls keep flowing."""
+        if self._html_pool is None:
+            self._html_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+        return await asyncio.get_running_loop().run_in_executor(
+            self._html_pool, _clean_html_text, html_content, settings.llm_clean_profile
+        )
+
+    async def _store_result(self, cache_key: str, cleaned_html: str, source_url: str, result: Dict[str, Any]) -> None:
+        """Cache an accepted parse under its content hash and as the URL's latest parse."""
+        await self._cache_set(cache_key, result)
+        await self._cache_set(self._page_cache_key(source_url), {"text": cleaned_html, "result": result})
+
+    async def _parse_cleaned_html(self, cleaned_html: str, source_url: str) -> Dict[str, Any]:
+        """Parse already-cleaned page text, using the caches and retrying on bad replies."""
         if not cleaned_html:
             logger.warning("No content to parse after HTML cleaning")
             return {"error": "no_content_after_cleaning"}
         
+        # Unchanged pages reuse their previous parse
+        cache_key = self._cache_key(cleaned_html, source_url)
+        cached_result = await self._cache_get(cache_key)
+        if cached_result is not None:
+            logger.info(f"Using cached LLM parse for {source_url}")
+            return cached_result
+        
+        # Pages that only changed trivially (dates, news sidebars) reuse it too
+        cached_result = await self._similar_cache_get(source_url, cleaned_html)
+        if cached_result is not None:
+            logger.info(f"Using LLM parse of near-identical content for {source_url}")
+            await self._cache_set(cache_key, cached_result)
+            return cached_result
+        
         # Make API call with retries for invalid JSON and poor quality titles
         max_json_retries = 3  # Extra retries specifically for JSON parsing issues
         max_quality_retries = 5  # Retries for poor title quality
         
+        # Rough input size for TPM accounting (~4 characters per token)
+        estimated_tokens = (len(_PROMPT_PREFIX) + len(_PROMPT_SUFFIX) + len(source_url) + len(cleaned_html)) // 4
+        
+        # Size the output budget to the page so short pages finish sooner
+        max_output_tokens = max(256, min(settings.llm_max_tokens, 256 + len(cleaned_html) // 20))
+        
         for attempt in range(settings.max_parsing_retries + 1):
             try:
+                # Wait for rate-limit capacity outside the per-call timeout
+                await self._wait_for_rate_limit(estimated_tokens)
                 result = await asyncio.wait_for(
-                    self._call_gemini_api(cleaned_html, source_url),
+                    self._call_gemini_api(cleaned_html, source_url, max_output_tokens),
                     timeout=settings.parsing_timeout
                 )
                 
+                # A truncated reply gets another try with a bigger output budget
+                if (result.get("truncated") and max_output_tokens < settings.llm_max_tokens
+                        and attempt < settings.max_parsing_retries):
+                    max_output_tokens = min(settings.llm_max_tokens, max_output_tokens * 2)
+                    logger.warning(f"Truncated Gemini reply for {source_url}, retrying with max_output_tokens={max_output_tokens}")
+                    continue
+                
                 # If successful, check title quality
                 if result.get("success"):
                     quality_validation = result.get("quality_validation", {})
@@ -384,26 +815,27 @@ Respond with ONLY the JSON array:
                         if not quality_validation.get("valid", True):
                             logger.warning(f"Accepting low-quality titles after {max_quality_retries} retries for {source_url}")
                             logger.warning(f"Quality issues: {quality_validation.get('issues', [])}")
+                        await self._store_result(cache_key, cleaned_html, source_url, result)
                         return result
                     else:
                         # Poor quality titles - retry with enhanced prompt
                         quality_score = quality_validation.get("quality_score", 0)
                         problematic_count = quality_validation.get("problematic_count", 0)
                         logger.warning(f"Poor title quality (score: {quality_score:.2f}, {problematic_count} issues) for {source_url} - retry {attempt + 1}/{max_quality_retries}")
-                        await asyncio.sleep(1.0 * (attempt + 1))  # Short delay for quality retries
+                        await asyncio.sleep(self._backoff_delay(attempt, 1.0))  # Short delay for quality retries
                         continue
                 
                 # If it's a JSON decode error and we have retries left, try again
                 error_msg = result.get("error", "")
                 if "json_decode_error" in error_msg and attempt < max_json_retries:
                     logger.warning(f"JSON parsing attempt {attempt + 1} failed: {error_msg}. Retrying...")
-                    await asyncio.sleep(1.0 * (attempt + 1))  # Exponential backoff
+                    await asyncio.sleep(self._backoff_delay(attempt, 1.0))
                     continue
                 
                 # For other errors, use normal retry logic
                 if attempt < settings.max_parsing_retries:
                     logger.warning(f"Parsing attempt {attempt + 1} failed: {error_msg}. Retrying...")
-                    await asyncio.sleep(2.0 * (attempt + 1))  # Exponential backoff
+                    await asyncio.sleep(self._backoff_delay(attempt, 2.0))
                     continue
                 else:
                     return result
@@ -412,7 +844,7 @@ Respond with ONLY the JSON array:
                 error_msg = f"LLM parsing timeout after {settings.parsing_timeout}s"
                 if attempt < settings.max_parsing_retries:
                     logger.warning(f"{error_msg}. Retrying...")
-                    await asyncio.sleep(2.0 * (attempt + 1))
+                    await asyncio.sleep(self._backoff_delay(attempt, 2.0))
                     continue
                 else:
                     logger.error(error_msg)
@@ -421,7 +853,7 @@ Respond with ONLY the JSON array:
                 error_msg = f"Unexpected error during LLM parsing: {e}"
                 if attempt < settings.max_parsing_retries:
                     logger.warning(f"{error_msg}. Retrying...")
-                    await asyncio.sleep(2.0 * (attempt + 1))
+                    await asyncio.sleep(self._backoff_delay(attempt, 2.0))
                     continue
                 else:
                     logger.error(error_msg)
@@ -429,6 +861,267 @@ Respond with ONLY the JSON array:
         
         return {"error": "max_retries_exceeded"}
 
+    async def _call_gemini_packed(self, pages: List[Tuple[str, str]]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Parse several small pages with one Gemini call.
+        
+        Args:
+            pages: (source_url, cleaned_html) pairs
+            
+        Returns:
+            Parse results keyed by source URL (pages the reply skipped are missing),
+            or None if the call failed
+        """
+        page_sections = "\n\n".join(f"=== SOURCE {url} ===\n{cleaned_html}" for url, cleaned_html in pages)
+        prompt = f"{_PACKED_PROMPT_PREFIX}\n\n{page_sections}\n\n{_PACKED_PROMPT_SUFFIX}"
+        
+        await self._wait_for_rate_limit(len(prompt) // 4)
+        if not await self._reserve_daily_calls():
+            return None
+        
+        config_kwargs = {"max_output_tokens": settings.llm_max_tokens, "temperature": 0.1}
+        if _supports_json_mode(settings.gemini_model):
+            config_kwargs["response_mime_type"] = "application/json"
+        
+        try:
+            response = await asyncio.wait_for(
+                self.client.aio.models.generate_content(
+                    model=settings.gemini_model,
+                    contents=prompt,
+                    config=self._types.GenerateContentConfig(**config_kwargs)
+                ),
+                timeout=settings.parsing_timeout
+            )
+            response_text = response.text or ""
+            json_text = response_text[response_text.find('{'):response_text.rfind('}') + 1]
+            try:
+                parsed_pages = orjson.loads(json_text)
+            except orjson.JSONDecodeError:
+                parsed_pages = orjson.loads(_ESCAPE_REPAIR_RE.sub(_repair_escape, json_text))
+        except Exception as e:
+            if getattr(e, 'code', None) == 429 or 'RESOURCE_EXHAUSTED' in str(e):
+                self._start_cooldown(e)
+            logger.warning(f"Packed Gemini call for {len(pages)} pages failed: {e}")
+            return None
+        
+        if not isinstance(parsed_pages, dict):
+            return None
+        return {
+            url: self._build_parse_result(opportunities, url)
+            for url, opportunities in parsed_pages.items()
+            if isinstance(opportunities, list)
+        }
+
+    async def _parse_pages(self, html_contents: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Parse pages concurrently, packing small pages into shared prompts.
+        
+        Pages whose cleaned text is at most ``llm_pack_page_chars`` are grouped
+        (up to ``llm_pack_max_pages`` pages / ``llm_pack_max_chars`` characters)
+        into one call. Any page the packed reply misses or gets low-quality titles
+        for is parsed on its own.
+        """
+        if not settings.enable_llm_parsing or not self.client:
+            # Let parse_html_content report why nothing was parsed
+            return [await self.parse_html_content(item.get('html', ''), item.get('source_url', 'unknown'))
+                    for item in html_contents]
+        
+        # Overlap Gemini round trips, bounded to stay under the RPM ceiling
+        semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+        parse_results: List[Optional[Dict[str, Any]]] = [None] * len(html_contents)
+        
+        async def _parse_one(index: int, cleaned_html: str, source_url: str) -> None:
+            try:
+                async with semaphore:
+                    parse_results[index] = await self._parse_cleaned_html(cleaned_html, source_url)
+            except Exception as e:
+                logger.error(f"Error processing {source_url}: {e}")
+                parse_results[index] = {"error": f"processing_error: {e}"}
+        
+        async def _parse_group(group: List[Tuple[int, str, str]]) -> None:
+            async with semaphore:
+                packed = await self._call_gemini_packed([(url, cleaned_html) for _, cleaned_html, url in group])
+            retries = []
+            for index, cleaned_html, url in group:
+                result = (packed or {}).get(url)
+                if result and result["quality_validation"].get("valid", True):
+                    parse_results[index] = result
+                    await self._store_result(self._cache_key(cleaned_html, url), cleaned_html, url, result)
+                else:
+                    retries.append(_parse_one(index, cleaned_html, url))
+            await asyncio.gather(*retries)
+        
+        cleaned_pages = await asyncio.gather(
+            *(self._clean_in_pool(item.get('html', '')) for item in html_contents)
+        )
+        
+        tasks = []
+        # (index, cleaned_html, source_url), the same order _parse_one takes
+        small_pages: List[Tuple[int, str, str]] = []
+        for index, (item, cleaned_html) in enumerate(zip(html_contents, cleaned_pages)):
+            source_url = item.get('source_url', 'unknown')
+            if random.random() > settings.llm_parse_percent:
+                parse_results[index] = {"error": "skipped_sampling"}
+            elif (cleaned_html and settings.llm_pack_max_pages > 1
+                    and len(cleaned_html) <= settings.llm_pack_page_chars):
+                cached_result = await self._cache_get(self._cache_key(cleaned_html, source_url))
+                if cached_result is not None:
+                    parse_results[index] = cached_result
+                else:
+                    small_pages.append((index, cleaned_html, source_url))
+            else:
+                tasks.append(_parse_one(index, cleaned_html, source_url))
+        
+        # Greedily fill groups in page order
+        group: List[Tuple[int, str, str]] = []
+        group_chars = 0
+        for page in small_pages:
+            if group and (len(group) >= settings.llm_pack_max_pages
+                          or group_chars + len(page[1]) > settings.llm_pack_max_chars):
+                tasks.append(_parse_group(group) if len(group) > 1 else _parse_one(*group[0]))
+                group, group_chars = [], 0
+            group.append(page)
+            group_chars += len(page[1])
+        if group:
+            tasks.append(_parse_group(group) if len(group) > 1 else _parse_one(*group[0]))
+        
+        await asyncio.gather(*tasks)
+        return [result or {"error": "processing_error: no result"} for result in parse_results]
+
+    async def _run_batch_job(self, html_contents: List[Dict[str, str]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parse a batch of pages through the Gemini Batch API.
+        
+        Prompts are written to a JSONL file, uploaded, and submitted as a single
+        batch job which is polled until it finishes. Returns one parse result per
+        input item, or None when the batch could not be run so the caller can fall
+        back to per-page calls.
+        """
+        parse_results: List[Optional[Dict[str, Any]]] = [None] * len(html_contents)
+        sampled = []
+        for index in range(len(html_contents)):
+            if random.random() > settings.llm_parse_percent:
+                parse_results[index] = {"error": "skipped_sampling"}
+            else:
+                sampled.append(index)
+        
+        cleaned_pages = await asyncio.gather(
+            *(self._clean_in_pool(html_contents[index].get('html', '')) for index in sampled)
+        )
+        
+        generation_config = {"temperature": 0.1, "max_output_tokens": settings.llm_max_tokens}
+        if _supports_json_mode(settings.gemini_model):
+            generation_config["response_mime_type"] = "application/json"
+            generation_config["response_schema"] = _OPPORTUNITY_LIST_SCHEMA
+        
+        # Build one request line per uncached page, keyed so results can be mapped back
+        pending: Dict[str, Tuple[int, str, str]] = {}  # key -> (index, cleaned_html, cache_key)
+        lines = []
+        for index, cleaned_html in zip(sampled, cleaned_pages):
+            source_url = html_contents[index].get('source_url', 'unknown')
+            if not cleaned_html:
+                parse_results[index] = {"error": "no_content_after_cleaning"}
+                continue
+            
+            # Unchanged or near-identical pages reuse their previous parse
+            cache_key = self._cache_key(cleaned_html, source_url)
+            cached_result = await self._cache_get(cache_key)
+            if cached_result is None:
+                cached_result = await self._similar_cache_get(source_url, cleaned_html)
+                if cached_result is not None:
+                    await self._cache_set(cache_key, cached_result)
+            if cached_result is not None:
+                parse_results[index] = cached_result
+                continue
+            
+            key = f"{index}-{hashlib.blake2b(source_url.encode(), digest_size=8).hexdigest()}"
+            pending[key] = (index, cleaned_html, cache_key)
+            lines.append(orjson.dumps({
+                "key": key,
+                "request": {
+                    "contents": [{"parts": [{"text": self._build_prompt(cleaned_html, source_url)}]}],
+                    "generation_config": generation_config
+                }
+            }))
+        
+        if not lines:
+            return parse_results
+        
+        if not await self._reserve_daily_calls(len(lines)):
+            logger.warning(f"Batch of {len(lines)} requests would exceed the daily Gemini budget")
+            return None
+        
+        jsonl_path = None
+        completed = False
+        try:
+            with tempfile.NamedTemporaryFile('wb', suffix='.jsonl', delete=False) as jsonl_file:
+                jsonl_file.write(b'\n'.join(lines))
+                jsonl_path = jsonl_file.name
+            
+            uploaded = await asyncio.to_thread(
+                self.client.files.upload,
+                file=jsonl_path,
+                config=self._types.UploadFileConfig(display_name='opportunity-parsing', mime_type='jsonl')
+            )
+            batch_job = await asyncio.to_thread(
+                self.client.batches.create,
+                model=settings.gemini_model,
+                src=uploaded.name,
+                config={'display_name': f"opportunity-parsing-{datetime.now():%Y%m%d-%H%M%S}"}
+            )
+            logger.info(f"Submitted Gemini batch job {batch_job.name} with {len(lines)} requests")
+            
+            # Poll until the job reaches a terminal state
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.llm_batch_timeout
+            state = batch_job.state.name if batch_job.state else ''
+            while state not in _BATCH_TERMINAL_STATES:
+                if loop.time() > deadline:
+                    logger.warning(f"Gemini batch job {batch_job.name} timed out in state {state}")
+                    await asyncio.to_thread(self.client.batches.cancel, name=batch_job.name)
+                    return None
+                await asyncio.sleep(settings.llm_batch_poll_interval)
+                batch_job = await asyncio.to_thread(self.client.batches.get, name=batch_job.name)
+                state = batch_job.state.name if batch_job.state else ''
+            
+            if state != 'JOB_STATE_SUCCEEDED':
+                logger.error(f"Gemini batch job {batch_job.name} finished with state {state}: {batch_job.error}")
+                return None
+            
+            # Download the results file and map each line back to its page
+            content = await asyncio.to_thread(self.client.files.download, file=batch_job.dest.file_name)
+            for raw_line in content.splitlines():
+                if not raw_line.strip():
+                    continue
+                line = orjson.loads(raw_line)
+                if line.get('key') not in pending:
+                    continue
+                index, cleaned_html, cache_key = pending[line['key']]
+                source_url = html_contents[index].get('source_url', 'unknown')
+                if 'error' in line or 'response' not in line:
+                    parse_results[index] = {"error": f"api_call_failed: {line.get('error')}"}
+                    continue
+                candidates = line['response'].get('candidates') or [{}]
+                parts = (candidates[0].get('content') or {}).get('parts') or []
+                response_text = ''.join(part.get('text', '') for part in parts)
+                result = self._parse_response_text(response_text, source_url)
+                parse_results[index] = result
+                if result.get("success") and result["quality_validation"].get("valid", True):
+                    await self._store_result(cache_key, cleaned_html, source_url, result)
+            
+            completed = True
+            return [result or {"error": "missing_batch_result"} for result in parse_results]
+            
+        except Exception as e:
+            logger.error(f"Gemini batch job failed: {e}")
+            return None
+        finally:
+            if jsonl_path:
+                os.unlink(jsonl_path)
+            if not completed:
+                # The caller falls back to per-page calls, which reserve these pages again
+                await self._release_daily_calls(len(lines))
+
     async def process_opportunities_batch(
         self, 
         html_contents: List[Dict[str, str]]
@@ -436,6 +1129,10 @@ Respond with ONLY the JSON array:
         """
         Process a batch of HTML contents for opportunities.
         
+        Large batches go through the Gemini Batch API when ``llm_use_batch_api``
+        is enabled; otherwise (or if the batch job fails) pages are parsed with
+        up to ``llm_max_concurrency`` calls in flight, small pages sharing a call.
+        
         Args:
             html_contents: List of dicts with 'html' and 'source_url' keys
             
@@ -453,33 +1150,29 @@ Respond with ONLY the JSON array:
         
         logger.info(f"Processing batch of {len(html_contents)} HTML contents")
         
+        parse_results = None
+        if (settings.llm_use_batch_api and settings.enable_llm_parsing and self.client
+                and len(html_contents) >= settings.llm_batch_min_items):
+            parse_results = await self._run_batch_job(html_contents)
+            if parse_results is None:
+                logger.warning("Gemini batch job unavailable, falling back to per-page parsing")
+        
+        if parse_results is None:
+            parse_results = await self._parse_pages(html_contents)
+        
         results = []
         successful_parses = 0
         opportunities_found = 0
         
-        for item in html_contents:
-            html_content = item.get('html', '')
-            source_url = item.get('source_url', 'unknown')
+        for item, parse_result in zip(html_contents, parse_results):
+            if parse_result.get("success"):
+                successful_parses += 1
+                opportunities_found += len(parse_result.get("opportunities", []))
             
-            try:
-                parse_result = await self.parse_html_content(html_content, source_url)
-                
-                if parse_result.get("success"):
-                    successful_parses += 1
-                    opportunities = parse_result.get("opportunities", [])
-                    opportunities_found += len(opportunities)
-                
-                results.append({
-                    "source_url": source_url,
-                    "parse_result": parse_result
-                })
-                
-            except Exception as e:
-                logger.error(f"Error processing {source_url}: {e}")
-                results.append({
-                    "source_url": source_url,
-                    "parse_result": {"error": f"processing_error: {e}"}
-                })
+            results.append({
+                "source_url": item.get('source_url', 'unknown'),
+                "parse_result": parse_result
+            })
         
         return {
             "total_processed": len(html_contents),
@@ -487,7 +1180,7 @@ Respond with ONLY the JSON array:
             "failed_parses": len(html_contents) - successful_parses,
             "opportunities_found": opportunities_found,
             "results": results,
-            "api_calls_used": self._calls_today_count
+            "api_calls_used": self.daily_call_count
         }
 
 
@@ -10,9 +10,10 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple, Set
 from difflib import SequenceMatcher
 import re
+from urllib.parse import urlsplit
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, insert
 
 from loguru import logger
 
@@ -33,26 +34,20 @@ class OpportunityTrackingService:
         self.similarity_threshold = similarity_threshold
         
     def _generate_content_hash(self, opportunity: Dict[str, Any]) -> str:
-        """Generate a hash of the key content fields for similarity detection."""
-        # Combine key fields that identify an opportunity
-        key_content = {
-            'title': (opportunity.get('title') or '').strip().lower(),
-            'description': (opportunity.get('description') or '').strip().lower()[:500],  # First 500 chars
-            'department': (opportunity.get('department') or '').strip().lower(),
-            'source_url': opportunity.get('source_url', ''),
-            'deadline': (opportunity.get('deadline') or '').strip(),
-            'funding_amount': (opportunity.get('funding_amount') or '').strip()
-        }
+        """Generate a hash of the key content fields for similarity detection.
         
-        # Create a consistent string representation
-        content_str = '|'.join([
-            key_content['title'],
-            key_content['description'],
-            key_content['department'],
-            key_content['source_url'],
-            key_content['deadline'],
-            key_content['funding_amount']
-        ])
+        Stays SHA-256 so stored hashes keep matching; OpenSSL's implementation uses
+        the CPU's SHA extensions where available.
+        """
+        # Combine key fields that identify an opportunity in a consistent string representation
+        content_str = '|'.join((
+            (opportunity.get('title') or '').strip().lower(),
+            (opportunity.get('description') or '').strip().lower()[:500],  # First 500 chars
+            (opportunity.get('department') or '').strip().lower(),
+            opportunity.get('source_url', ''),
+            (opportunity.get('deadline') or '').strip(),
+            (opportunity.get('funding_amount') or '').strip()
+        ))
         
         # Generate SHA-256 hash
         return hashlib.sha256(content_str.encode('utf-8')).hexdigest()
@@ -122,9 +117,8 @@ class OpportunityTrackingService:
         source_url = opportunity.get('source_url', '')
         domain = ''
         if source_url:
-            from urllib.parse import urlparse
             try:
-                domain = urlparse(source_url).netloc.lower()
+                domain = urlsplit(source_url).netloc.lower()
             except:
                 domain = source_url[:50]  # Fallback
         
@@ -141,180 +135,210 @@ class OpportunityTrackingService:
         if not opportunities:
             return {"new_count": 0, "updated_count": 0, "missing_count": 0, "reappeared_count": 0}
         
+        return self.process_scraped_batches([(source_url, opportunities)])[0]
+    
+    def process_scraped_batches(self, batches: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        Process scraped opportunities for several source URLs in one transaction.
+        
+        Args:
+            batches: (source_url, opportunities) pairs
+            
+        Returns:
+            One counts dict per batch, in the same order
+        """
         db: Session = SessionLocal()
         current_scrape_time = datetime.now()
         
         try:
-            # Get all existing opportunities from the same source
-            existing_opps = db.query(Opportunity).filter(
-                Opportunity.source_url == source_url
-            ).all()
+            results = []
+            for source_url, opportunities in batches:
+                if not opportunities:
+                    results.append({"new_count": 0, "updated_count": 0, "missing_count": 0, "reappeared_count": 0})
+                else:
+                    results.append(self._track_source(db, opportunities, source_url, current_scrape_time))
             
-            # Convert to dict format for comparison
-            existing_opps_dict = [
-                {
-                    'id': opp.id,
-                    'title': opp.title,
-                    'description': opp.description,
-                    'department': opp.department,
-                    'source_url': opp.source_url,
-                    'deadline': opp.deadline,
-                    'funding_amount': opp.funding_amount,
-                    'content_hash': opp.content_hash,
-                    'status': opp.status,
-                    'consecutive_missing_count': opp.consecutive_missing_count
-                }
-                for opp in existing_opps
-            ]
+            # A single commit covers every source in the batch
+            db.commit()
+            return results
             
-            # Track which existing opportunities were found in this scrape
-            found_opportunity_ids = set()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error in opportunity tracking: {e}")
+            raise
+        finally:
+            db.close()
+    
+    def _track_source(self, db: Session, opportunities: List[Dict[str, Any]], source_url: str,
+                      current_scrape_time: datetime) -> Dict[str, Any]:
+        """Apply tracking updates for one source URL inside an open session (no commit)."""
+        # Get all existing opportunities from the same source
+        existing_opps = db.query(Opportunity).filter(
+            Opportunity.source_url == source_url
+        ).all()
+        
+        # Convert to dict format for comparison
+        existing_opps_dict = [
+            {
+                'id': opp.id,
+                'title': opp.title,
+                'description': opp.description,
+                'department': opp.department,
+                'source_url': opp.source_url,
+                'deadline': opp.deadline,
+                'funding_amount': opp.funding_amount,
+                'content_hash': opp.content_hash,
+                'status': opp.status,
+                'consecutive_missing_count': opp.consecutive_missing_count
+            }
+            for opp in existing_opps
+        ]
+        
+        # Index the prefetched rows so matches need no further queries
+        existing_by_id = {opp.id: opp for opp in existing_opps}
+        existing_by_hash = {}
+        for opp in existing_opps:
+            existing_by_hash.setdefault(opp.content_hash, opp)
+        
+        # Track which existing opportunities were found in this scrape
+        found_opportunity_ids = set()
+        
+        new_count = 0
+        updated_count = 0
+        reappeared_count = 0
+        new_rows = []  # Collected for a single multi-row INSERT
+        
+        # Process each scraped opportunity
+        for scraped_opp in opportunities:
+            content_hash = self._generate_content_hash(scraped_opp)
+            similarity_group_id = self._generate_similarity_group_id(scraped_opp)
             
-            new_count = 0
-            updated_count = 0
-            reappeared_count = 0
+            # Try exact hash match first
+            exact_match = existing_by_hash.get(content_hash)
             
-            # Process each scraped opportunity
-            for scraped_opp in opportunities:
-                content_hash = self._generate_content_hash(scraped_opp)
-                similarity_group_id = self._generate_similarity_group_id(scraped_opp)
+            if exact_match:
+                # Exact match found - update timestamps
+                exact_match.last_seen_at = current_scrape_time
+                exact_match.scraped_at = current_scrape_time
                 
-                # Try exact hash match first
-                exact_match = None
-                for existing_opp in existing_opps:
-                    if existing_opp.content_hash == content_hash:
-                        exact_match = existing_opp
-                        break
+                # If it was missing, mark as reappeared
+                if exact_match.status == 'missing':
+                    exact_match.status = 'active'
+                    exact_match.consecutive_missing_count = 0
+                    reappeared_count += 1
+                    logger.info(f"Opportunity reappeared: {exact_match.title}")
                 
-                if exact_match:
-                    # Exact match found - update timestamps
-                    exact_match.last_seen_at = current_scrape_time
-                    exact_match.scraped_at = current_scrape_time
+                found_opportunity_ids.add(exact_match.id)
+                continue
+            
+            # No exact match - check for similar opportunities
+            similar_opps = self._find_similar_opportunities(scraped_opp, existing_opps_dict)
+            
+            if similar_opps:
+                # Similar opportunity found - update it
+                best_match, similarity_score = similar_opps[0]
+                existing_opp = existing_by_id.get(best_match['id'])
+                
+                if existing_opp:
+                    # Update content and hash
+                    existing_opp.title = scraped_opp.get('title', existing_opp.title)
+                    existing_opp.description = scraped_opp.get('description', existing_opp.description)
+                    existing_opp.department = scraped_opp.get('department', existing_opp.department)
+                    existing_opp.deadline = scraped_opp.get('deadline', existing_opp.deadline)
+                    existing_opp.funding_amount = scraped_opp.get('funding_amount', existing_opp.funding_amount)
+                    existing_opp.content_hash = content_hash
+                    existing_opp.last_seen_at = current_scrape_time
+                    existing_opp.last_updated_at = current_scrape_time
+                    existing_opp.scraped_at = current_scrape_time
                     
                     # If it was missing, mark as reappeared
-                    if exact_match.status == 'missing':
-                        exact_match.status = 'active'
-                        exact_match.consecutive_missing_count = 0
+                    if existing_opp.status == 'missing':
+                        existing_opp.status = 'active'
+                        existing_opp.consecutive_missing_count = 0
                         reappeared_count += 1
-                        logger.info(f"Opportunity reappeared: {exact_match.title}")
+                        logger.info(f"Similar opportunity reappeared: {existing_opp.title} (similarity: {similarity_score:.2f})")
+                    else:
+                        existing_opp.status = 'active'
                     
-                    found_opportunity_ids.add(exact_match.id)
+                    found_opportunity_ids.add(existing_opp.id)
+                    updated_count += 1
+                    logger.info(f"Updated similar opportunity: {existing_opp.title} (similarity: {similarity_score:.2f})")
                     continue
+            
+            # No match found - queue new opportunity for bulk insert
+            new_rows.append(dict(
+                title=scraped_opp.get('title', 'Untitled'),
+                description=scraped_opp.get('description', ''),
+                department=scraped_opp.get('department', ''),
+                opportunity_type=scraped_opp.get('opportunity_type', 'research'),
+                eligibility_requirements=scraped_opp.get('eligibility_requirements'),
+                deadline=scraped_opp.get('deadline'),
+                funding_amount=scraped_opp.get('funding_amount'),
+                application_url=scraped_opp.get('application_url', source_url),
+                source_url=source_url,
+                contact_email=scraped_opp.get('contact_email'),
+                tags=scraped_opp.get('tags', []),
                 
-                # No exact match - check for similar opportunities
-                similar_opps = self._find_similar_opportunities(scraped_opp, existing_opps_dict)
-                
-                if similar_opps:
-                    # Similar opportunity found - update it
-                    best_match, similarity_score = similar_opps[0]
-                    existing_opp = db.query(Opportunity).filter(Opportunity.id == best_match['id']).first()
-                    
-                    if existing_opp:
-                        # Update content and hash
-                        existing_opp.title = scraped_opp.get('title', existing_opp.title)
-                        existing_opp.description = scraped_opp.get('description', existing_opp.description)
-                        existing_opp.department = scraped_opp.get('department', existing_opp.department)
-                        existing_opp.deadline = scraped_opp.get('deadline', existing_opp.deadline)
-                        existing_opp.funding_amount = scraped_opp.get('funding_amount', existing_opp.funding_amount)
-                        existing_opp.content_hash = content_hash
-                        existing_opp.last_seen_at = current_scrape_time
-                        existing_opp.last_updated_at = current_scrape_time
-                        existing_opp.scraped_at = current_scrape_time
-                        
-                        # If it was missing, mark as reappeared
-                        if existing_opp.status == 'missing':
-                            existing_opp.status = 'active'
-                            existing_opp.consecutive_missing_count = 0
-                            reappeared_count += 1
-                            logger.info(f"Similar opportunity reappeared: {existing_opp.title} (similarity: {similarity_score:.2f})")
-                        else:
-                            existing_opp.status = 'active'
-                        
-                        found_opportunity_ids.add(existing_opp.id)
-                        updated_count += 1
-                        logger.info(f"Updated similar opportunity: {existing_opp.title} (similarity: {similarity_score:.2f})")
-                        continue
+                # LLM metadata
+                llm_parsed=scraped_opp.get('llm_parsed', False),
+                parsing_confidence=scraped_opp.get('parsing_confidence'),
+                scraper_used=scraped_opp.get('scraper_used'),
+                llm_error=scraped_opp.get('llm_error'),
+                processed_at=scraped_opp.get('processed_at'),
                 
-                # No match found - create new opportunity
-                new_opportunity = Opportunity(
-                    title=scraped_opp.get('title', 'Untitled'),
-                    description=scraped_opp.get('description', ''),
-                    department=scraped_opp.get('department', ''),
-                    opportunity_type=scraped_opp.get('opportunity_type', 'research'),
-                    eligibility_requirements=scraped_opp.get('eligibility_requirements'),
-                    deadline=scraped_opp.get('deadline'),
-                    funding_amount=scraped_opp.get('funding_amount'),
-                    application_url=scraped_opp.get('application_url', source_url),
-                    source_url=source_url,
-                    contact_email=scraped_opp.get('contact_email'),
-                    tags=scraped_opp.get('tags', []),
-                    
-                    # LLM metadata
-                    llm_parsed=scraped_opp.get('llm_parsed', False),
-                    parsing_confidence=scraped_opp.get('parsing_confidence'),
-                    scraper_used=scraped_opp.get('scraper_used'),
-                    llm_error=scraped_opp.get('llm_error'),
-                    processed_at=scraped_opp.get('processed_at'),
-                    
-                    # Tracking metadata
-                    content_hash=content_hash,
-                    similarity_group_id=similarity_group_id,
-                    first_seen_at=current_scrape_time,
-                    last_seen_at=current_scrape_time,
-                    last_updated_at=current_scrape_time,
-                    status='new',
-                    consecutive_missing_count=0,
-                    
-                    # Standard metadata
-                    scraped_at=current_scrape_time,
-                    is_active=True
-                )
+                # Tracking metadata
+                content_hash=content_hash,
+                similarity_group_id=similarity_group_id,
+                first_seen_at=current_scrape_time,
+                last_seen_at=current_scrape_time,
+                last_updated_at=current_scrape_time,
+                status='new',
+                consecutive_missing_count=0,
                 
-                db.add(new_opportunity)
-                new_count += 1
-                logger.info(f"New opportunity discovered: {new_opportunity.title}")
-            
-            # Mark opportunities that weren't found in this scrape as missing
-            missing_count = 0
-            for existing_opp in existing_opps:
-                if existing_opp.id not in found_opportunity_ids and existing_opp.status != 'removed':
-                    existing_opp.consecutive_missing_count += 1
-                    
-                    if existing_opp.consecutive_missing_count >= 3:
-                        # Missing for 3+ scrapes - mark as removed
-                        existing_opp.status = 'removed'
-                        existing_opp.is_active = False
-                        logger.info(f"Opportunity marked as removed: {existing_opp.title}")
-                    else:
-                        # Recently missing
-                        existing_opp.status = 'missing'
-                        missing_count += 1
-                        logger.info(f"Opportunity missing (count: {existing_opp.consecutive_missing_count}): {existing_opp.title}")
+                # Standard metadata
+                scraped_at=current_scrape_time,
+                is_active=True
+            ))
             
-            # After first scrape, change 'new' status to 'active' for opportunities that are still new
-            db.query(Opportunity).filter(
-                and_(
-                    Opportunity.source_url == source_url,
-                    Opportunity.status == 'new',
-                    Opportunity.first_seen_at < current_scrape_time - timedelta(minutes=1)  # Give 1 minute buffer
-                )
-            ).update({Opportunity.status: 'active'})
-            
-            db.commit()
-            
-            return {
-                "new_count": new_count,
-                "updated_count": updated_count,
-                "missing_count": missing_count,
-                "reappeared_count": reappeared_count
-            }
-            
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Error in opportunity tracking: {e}")
-            raise
-        finally:
-            db.close()
+            new_count += 1
+            logger.info(f"New opportunity discovered: {new_rows[-1]['title']}")
+        
+        # Insert all new opportunities in one executemany round-trip
+        if new_rows:
+            db.execute(insert(Opportunity), new_rows)
+        
+        # Mark opportunities that weren't found in this scrape as missing
+        missing_count = 0
+        for existing_opp in existing_opps:
+            if existing_opp.id not in found_opportunity_ids and existing_opp.status != 'removed':
+                existing_opp.consecutive_missing_count += 1
+                
+                if existing_opp.consecutive_missing_count >= 3:
+                    # Missing for 3+ scrapes - mark as removed
+                    existing_opp.status = 'removed'
+                    existing_opp.is_active = False
+                    logger.info(f"Opportunity marked as removed: {existing_opp.title}")
+                else:
+                    # Recently missing
+                    existing_opp.status = 'missing'
+                    missing_count += 1
+                    logger.info(f"Opportunity missing (count: {existing_opp.consecutive_missing_count}): {existing_opp.title}")
+        
+        # After first scrape, change 'new' status to 'active' for opportunities that are still new
+        db.query(Opportunity).filter(
+            and_(
+                Opportunity.source_url == source_url,
+                Opportunity.status == 'new',
+                Opportunity.first_seen_at < current_scrape_time - timedelta(minutes=1)  # Give 1 minute buffer
+            )
+        ).update({Opportunity.status: 'active'})
+        
+        return {
+            "new_count": new_count,
+            "updated_count": updated_count,
+            "missing_count": missing_count,
+            "reappeared_count": reappeared_count
+        }
     
     def get_recent_new_opportunities(self, days: int = 7) -> List[Dict[str, Any]]:
         """Get opportunities that are newly discovered in the last N days."""
@@ -1,9 +1,13 @@
 import asyncio
-from typing import List, Dict, Any, Optional, Type
+from typing import List, Dict, Any, Optional, Tuple, Type
 from datetime import datetime, timedelta
 import hashlib
-from urllib.parse import urlparse
+import time
+from functools import lru_cache
+from urllib.parse import urlsplit
 
+import aiohttp
+import orjson
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
@@ -16,6 +20,13 @@ from ..scrapers.base_scraper import BaseScraper
 from ..scrapers.undergrad_research_scraper import UndergradResearchScraper
 from ..scrapers.stanford_program_scraper import StanfordProgramScraper
 from .opportunity_tracking_service import opportunity_tracking_service
+from .llm_validation_service import llm_parsing_service
+
+
+@lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
+    """Return the lowercased network location of a URL."""
+    return urlsplit(url).netloc.lower()
 
 
 class ScrapingService:
@@ -57,67 +68,101 @@ class ScrapingService:
             # Keep the original scraper for general undergraduate research pages
             "undergradresearch.stanford.edu": UndergradResearchScraper,
         }
+        
+        # Registered domains keyed by reversed labels, e.g. ("edu", "stanford", "curis")
+        self._suffix_map: Dict[tuple, Type[BaseScraper]] = {
+            tuple(reversed(pattern.split("."))): scraper_class
+            for pattern, scraper_class in self.scrapers.items()
+        }
+        
+        # Global and per-host concurrency limits, created lazily for the running event loop
+        self._limits_loop = None
+        self._global_sem: Optional[asyncio.Semaphore] = None
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
 
-    def get_scraper(self, url: str) -> BaseScraper:
-        """Get the appropriate scraper for a given URL."""
+    def get_scraper(self, url: str, domain: Optional[str] = None, **scraper_kwargs) -> BaseScraper:
+        """Get the appropriate scraper for a given URL; extra kwargs are passed to the scraper."""
         try:
-            domain = urlparse(url).netloc.lower()
+            if domain is None:
+                domain = _netloc(url)
             logger.debug(f"Selecting scraper for domain: {domain}")
             
-            # Try exact domain match first
-            if domain in self.scrapers:
-                scraper_class = self.scrapers[domain]
-                logger.info(f"Using {scraper_class.__name__} for {domain}")
-                return scraper_class(url)
+            # Walk hostname labels from the root, keeping the longest registered suffix
+            labels = tuple(reversed(domain.split(".")))
+            scraper_class = None
+            matched_depth = 0
+            for depth in range(1, len(labels) + 1):
+                candidate = self._suffix_map.get(labels[:depth])
+                if candidate is not None:
+                    scraper_class = candidate
+                    matched_depth = depth
             
-            # Try partial domain matches for Stanford sites
-            for domain_pattern, scraper_class in self.scrapers.items():
-                if domain_pattern in domain:
-                    logger.info(f"Using {scraper_class.__name__} for {domain} (matched pattern: {domain_pattern})")
-                    return scraper_class(url)
+            if scraper_class is not None:
+                pattern = ".".join(reversed(labels[:matched_depth]))
+                if matched_depth == len(labels):
+                    logger.info(f"Using {scraper_class.__name__} for {domain}")
+                else:
+                    logger.info(f"Using {scraper_class.__name__} for {domain} (matched pattern: {pattern})")
+                return scraper_class(url, **scraper_kwargs)
             
             # Default to Stanford program scraper for any Stanford site
             if "stanford" in domain:
                 logger.info(f"Using StanfordProgramScraper as default for Stanford domain: {domain}")
-                return StanfordProgramScraper(url)
+                return StanfordProgramScraper(url, **scraper_kwargs)
             
             # Final fallback to Stanford program scraper (don't use abstract BaseScraper)
             logger.warning(f"No specific scraper found for {domain}, using StanfordProgramScraper as fallback")
-            return StanfordProgramScraper(url)
+            return StanfordProgramScraper(url, **scraper_kwargs)
             
         except Exception as e:
             logger.error(f"Error selecting scraper for {url}: {e}")
             # Always return a concrete scraper, never the abstract base class
             logger.warning("Falling back to StanfordProgramScraper due to error")
-            return StanfordProgramScraper(url)
+            return StanfordProgramScraper(url, **scraper_kwargs)
+
+    def _concurrency_limits(self, domain: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """Return the global and per-host semaphores for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._limits_loop is not loop:
+            self._global_sem = asyncio.Semaphore(settings.max_concurrent_requests)
+            self._host_sems = {}
+            self._limits_loop = loop
+        
+        host_sem = self._host_sems.get(domain)
+        if host_sem is None:
+            host_sem = self._host_sems[domain] = asyncio.Semaphore(settings.max_requests_per_host)
+        return self._global_sem, host_sem
 
     # ------------------------------------------------------------------
     # Database persistence helper
     # ------------------------------------------------------------------
-    def _save_opportunities_to_db(self, opportunities: List[Dict[str, Any]], source_url: str) -> Dict[str, int]:
-        """Persist scraped opportunities using advanced tracking and similarity detection.
-
-        This function uses the OpportunityTrackingService to detect duplicates, track changes,
-        and maintain opportunity status between scrapes.
-        """
-        if not opportunities:
-            return {"new_count": 0, "updated_count": 0, "missing_count": 0, "reappeared_count": 0}
-
-        # Ensure tags is a list for all opportunities
+    @staticmethod
+    def _normalize_tags(opportunities: List[Dict[str, Any]]) -> None:
+        """Ensure tags is a list for all opportunities."""
         for opp in opportunities:
             tags = opp.get("tags") or []
             if isinstance(tags, str):
                 try:
                     # Try parsing as JSON first
-                    import json
-                    tags = json.loads(tags)
-                except (json.JSONDecodeError, ValueError):
+                    tags = orjson.loads(tags)
+                except orjson.JSONDecodeError:
                     # If not JSON, treat as single tag
                     tags = [tags]
             elif not isinstance(tags, list):
                 tags = []
             opp["tags"] = tags
 
+    def _save_opportunities_to_db(self, opportunities: List[Dict[str, Any]], source_url: str) -> Dict[str, int]:
+        """Persist scraped opportunities using advanced tracking and similarity detection.
+
+        This function uses the OpportunityTrackingService to detect duplicates, track changes,
+        and maintain opportunity status between scrapes.
+        """
+        if not opportunities:
+            return {"new_count": 0, "updated_count": 0, "missing_count": 0, "reappeared_count": 0}
+
+        self._normalize_tags(opportunities)
+
         # Use the tracking service to process opportunities
         try:
             result = opportunity_tracking_service.process_scraped_opportunities(opportunities, source_url)
@@ -128,25 +173,54 @@ class ScrapingService:
             # Fallback to basic counts if tracking fails
             return {"new_count": len(opportunities), "updated_count": 0, "missing_count": 0, "reappeared_count": 0}
 
-    async def scrape_single_url(self, url: str) -> Dict[str, Any]:
-        """Scrape a single URL and return results."""
+    def _save_batch(self, batches: List[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, int]]:
+        """Persist several URLs' opportunities in one transaction.
+
+        Falls back to saving each URL on its own if the shared transaction fails,
+        so one bad page does not lose the rest of the batch.
+        """
+        for _, opportunities in batches:
+            self._normalize_tags(opportunities)
+
+        try:
+            results = opportunity_tracking_service.process_scraped_batches(batches)
+            logger.info(f"Tracking results for {len(batches)} URLs saved in one transaction")
+            return results
+        except Exception as e:
+            logger.error(f"Batched save failed, saving {len(batches)} URLs individually: {e}")
+            return [self._save_opportunities_to_db(opportunities, source_url) for source_url, opportunities in batches]
+
+    async def scrape_single_url(self, url: str, persist: bool = True, **scraper_kwargs) -> Dict[str, Any]:
+        """Scrape a single URL and return results; extra kwargs (shared sessions) go to the scraper.
+
+        With persist=False the opportunities are not saved and the tracking counts are
+        left at zero for the caller to fill in after a batched save.
+        """
         logger.info(f"Starting scrape for: {url}")
         
-        start_time = datetime.now()
-        scraper = self.get_scraper(url)
+        start_time = time.monotonic()
+        domain = _netloc(url)
+        scraper = self.get_scraper(url, domain, **scraper_kwargs)
+        
+        global_sem, host_sem = self._concurrency_limits(domain)
         
         try:
-            opportunities = await scraper.scrape()
+            # Bound total scrapes and scrapes per host so one domain can't take every slot;
+            # the host slot comes first so tasks queued on a busy host don't hold global slots
+            async with host_sem, global_sem:
+                opportunities = await scraper.scrape()
 
             # Persist to the database
-            stats = self._save_opportunities_to_db(opportunities, url)
+            if persist:
+                stats = self._save_opportunities_to_db(opportunities, url)
+            else:
+                stats = {"new_count": 0, "updated_count": 0}
             new_count = stats["new_count"]
             updated_count = stats["updated_count"]
             missing_count = stats.get("missing_count", 0)
             reappeared_count = stats.get("reappeared_count", 0)
 
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.monotonic() - start_time
 
             result = {
                 "url": url,
@@ -159,15 +233,14 @@ class ScrapingService:
                 "reappeared_count": reappeared_count,
                 "scraping_time": duration,
                 "scraper_used": scraper.__class__.__name__,
-                "domain": urlparse(url).netloc
+                "domain": domain
             }
             
             logger.success(f"Scraped {url}: {len(opportunities)} opportunities found in {duration:.2f}s")
             return result
             
         except Exception as e:
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.monotonic() - start_time
             
             logger.error(f"Failed to scrape {url}: {e}")
             
@@ -179,7 +252,7 @@ class ScrapingService:
                 "opportunities": [],
                 "scraping_time": duration,
                 "scraper_used": scraper.__class__.__name__,
-                "domain": urlparse(url).netloc
+                "domain": domain
             }
 
     async def scrape_all_urls(self, urls: List[str] = None) -> List[Dict[str, Any]]:
@@ -189,45 +262,81 @@ class ScrapingService:
         
         logger.info(f"Starting scraping for {len(urls)} URLs")
         
-        # Create scraping tasks
-        tasks = [self.scrape_single_url(url) for url in urls]
+        # One connection pool for the whole crawl so keep-alive sockets and DNS lookups are reused
+        pool_size = settings.max_concurrent_requests * 4
+        session = BaseScraper.build_session(pool_size)
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size, ttl_dns_cache=300, keepalive_timeout=30)
+        )
         
-        # Execute scraping with concurrency control
-        semaphore = asyncio.Semaphore(settings.max_concurrent_requests)
+        async def scrape_indexed(index: int, url: str):
+            try:
+                return index, await self.scrape_single_url(
+                    url, persist=False, session=session, http_session=http_session
+                )
+            except Exception as e:
+                return index, e
         
-        async def scrape_with_semaphore(url):
-            async with semaphore:
-                return await self.scrape_single_url(url)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        pending_saves: List[Dict[str, Any]] = []  # Successful results awaiting a batched save
         
-        # Run all tasks concurrently but with rate limiting
-        results = await asyncio.gather(*[scrape_with_semaphore(url) for url in urls], return_exceptions=True)
+        async def flush_saves():
+            batch = pending_saves[:]
+            pending_saves.clear()
+            stats_list = await asyncio.to_thread(
+                self._save_batch, [(r["url"], r["opportunities"]) for r in batch]
+            )
+            for result, stats in zip(batch, stats_list):
+                result.update(stats)
+        total_opportunities = 0
+        successful_scrapes = 0
+        failed_scrapes = 0
         
-        # Process results
-        successful_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Exception occurred for URL {urls[i]}: {result}")
-                successful_results.append({
-                    "url": urls[i],
-                    "status": "error",
-                    "error": str(result),
-                    "opportunities_found": 0,
-                    "opportunities": [],
-                    "scraping_time": 0,
-                    "scraper_used": "Unknown",
-                    "domain": urlparse(urls[i]).netloc
-                })
-            else:
-                successful_results.append(result)
+        # Run all tasks concurrently (scrape_single_url applies the global and per-host limits)
+        # and handle each result as soon as it finishes instead of waiting for the slowest URL
+        try:
+            for next_done in asyncio.as_completed([scrape_indexed(i, url) for i, url in enumerate(urls)]):
+                index, result = await next_done
+                
+                if isinstance(result, Exception):
+                    logger.error(f"Exception occurred for URL {urls[index]}: {result}")
+                    result = {
+                        "url": urls[index],
+                        "status": "error",
+                        "error": str(result),
+                        "opportunities_found": 0,
+                        "opportunities": [],
+                        "scraping_time": 0,
+                        "scraper_used": "Unknown",
+                        "domain": _netloc(urls[index])
+                    }
+                
+                results[index] = result
+                if result.get('status') == 'success':
+                    successful_scrapes += 1
+                    total_opportunities += result.get('opportunities_found', 0)
+                    
+                    # Save every few URLs together while the remaining scrapes keep running
+                    pending_saves.append(result)
+                    if len(pending_saves) >= settings.db_batch_urls:
+                        await flush_saves()
+                else:
+                    failed_scrapes += 1
+                
+                logger.debug(f"Progress: {successful_scrapes + failed_scrapes}/{len(urls)} URLs done")
+            
+            if pending_saves:
+                await flush_saves()
+        finally:
+            await http_session.close()
+            session.close()
+            # Release the LLM service's loop-bound clients and cleanup threads
+            await llm_parsing_service.aclose()
         
         # Log summary
-        total_opportunities = sum(r.get('opportunities_found', 0) for r in successful_results)
-        successful_scrapes = sum(1 for r in successful_results if r.get('status') == 'success')
-        failed_scrapes = len(successful_results) - successful_scrapes
-        
         logger.info(f"Scraping completed: {successful_scrapes} successful, {failed_scrapes} failed, {total_opportunities} total opportunities")
         
-        return successful_results
+        return results
 
     async def scrape_all_websites(self, urls: List[str] = None) -> List[Dict[str, Any]]:
         """Scrape all Stanford research websites using the comprehensive RESEARCH_URLS list."""
@@ -271,37 +380,45 @@ class ScrapingService:
                 "success_rate": 0
             }
         
-        successful_results = [r for r in results if r.get('status') == 'success']
-        failed_results = [r for r in results if r.get('status') == 'error']
-        
-        domains = list(set(r.get('domain', 'unknown') for r in results))
+        # Aggregate everything in a single pass over the results
+        successful_count = 0
+        failed_count = 0
+        total_opportunities = 0
+        new_opportunities = 0
+        updated_opportunities = 0
+        missing_opportunities = 0
+        reappeared_opportunities = 0
+        llm_enhanced = 0
+        total_time = 0
+        domains = set()
         scrapers_used = {}
         
         for result in results:
+            domains.add(result.get('domain', 'unknown'))
             scraper = result.get('scraper_used', 'Unknown')
             scrapers_used[scraper] = scrapers_used.get(scraper, 0) + 1
+            total_time += result.get('scraping_time', 0)
+            
+            status = result.get('status')
+            if status == 'error':
+                failed_count += 1
+            elif status == 'success':
+                successful_count += 1
+                total_opportunities += result.get('opportunities_found', 0)
+                new_opportunities += result.get('new_count', 0)
+                updated_opportunities += result.get('updated_count', 0)
+                missing_opportunities += result.get('missing_count', 0)
+                reappeared_opportunities += result.get('reappeared_count', 0)
+                
+                # Count LLM enhanced opportunities
+                llm_enhanced += sum(1 for opp in result.get('opportunities', []) if opp.get('llm_parsed', False))
         
-        total_opportunities = sum(r.get('opportunities_found', 0) for r in successful_results)
-        new_opportunities = sum(r.get('new_count', 0) for r in successful_results)
-        updated_opportunities = sum(r.get('updated_count', 0) for r in successful_results)
-        missing_opportunities = sum(r.get('missing_count', 0) for r in successful_results)
-        reappeared_opportunities = sum(r.get('reappeared_count', 0) for r in successful_results)
-        
-        # Count LLM enhanced opportunities
-        llm_enhanced = 0
-        for result in successful_results:
-            opportunities = result.get('opportunities', [])
-            for opp in opportunities:
-                if opp.get('llm_parsed', False):
-                    llm_enhanced += 1
-        
-        total_time = sum(r.get('scraping_time', 0) for r in results)
-        avg_time = total_time / len(results) if results else 0
+        avg_time = total_time / len(results)
         
         return {
             "total_urls": len(results),
-            "successful_scrapes": len(successful_results),
-            "failed_scrapes": len(failed_results),
+            "successful_scrapes": successful_count,
+            "failed_scrapes": failed_count,
             "total_opportunities": total_opportunities,
             "new_opportunities": new_opportunities,
             "updated_opportunities": updated_opportunities,
@@ -310,9 +427,9 @@ class ScrapingService:
             "llm_enhanced": llm_enhanced,
             "average_scraping_time": round(avg_time, 2),
             "total_time_seconds": round(total_time, 2),
-            "domains_scraped": domains,
+            "domains_scraped": list(domains),
             "scrapers_used": scrapers_used,
-            "success_rate": round(len(successful_results) / len(results) * 100, 1) if results else 0
+            "success_rate": round(successful_count / len(results) * 100, 1)
         }
 
 
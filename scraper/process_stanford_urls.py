@@ -152,6 +152,7 @@ async def deep_llm_discovery(start_urls: List[str], max_depth: int = 2) -> Dict[
 
             await asyncio.gather(*[wrap(u) for u in start_urls])
 
+    await llm_service.aclose()
     return results
 
 
@@ -158,7 +158,7 @@ class URLValidator:
     
     async def _find_sub_urls(self, base_url: str, html: str) -> List[str]:
         """Find potential sub-URLs that might contain more specific opportunities."""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         base_domain = urlparse(base_url).netloc
         sub_urls = set()
         